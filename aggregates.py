@@ -0,0 +1,269 @@
+import threading
+
+import numpy as np
+
+# -------------------------------
+# Running per-slot energy aggregates
+# -------------------------------
+# Keeps sum, count and sum of squares in fixed-size arrays (one entry per
+# slot, 24 hourly slots by default). Each response updates three cells, so
+# reading the mean/variance curve never touches the raw history.
+
+
+class SlotAggregate:
+    def __init__(self, n_slots=24):
+        self.n_slots = n_slots
+        self.count = np.zeros(n_slots, dtype=np.int64)
+        self.total = np.zeros(n_slots, dtype=np.float64)
+        self.total_sq = np.zeros(n_slots, dtype=np.float64)
+        self._lock = threading.Lock()  # guards concurrent updates
+
+    # Build from existing (slot, energy) columns in a single bincount pass
+    @classmethod
+    def from_arrays(cls, slots, energies, n_slots=24):
+        agg = cls(n_slots)
+        agg.add_many(slots, energies)
+        return agg
+
+    def add(self, slot, energy):
+        with self._lock:
+            self.count[slot] += 1
+            self.total[slot] += energy
+            self.total_sq[slot] += energy * energy
+
+    def add_many(self, slots, energies):
+        slots = np.asarray(slots, dtype=np.int64)
+        energies = np.asarray(energies, dtype=np.float64)
+        count = np.bincount(slots, minlength=self.n_slots)
+        total = np.bincount(slots, weights=energies, minlength=self.n_slots)
+        total_sq = np.bincount(slots, weights=energies * energies, minlength=self.n_slots)
+        with self._lock:
+            self.count += count
+            self.total += total
+            self.total_sq += total_sq
+
+    @property
+    def empty(self):
+        return not self.count.any()
+
+    # Slots with at least one response
+    def observed(self):
+        return np.flatnonzero(self.count)
+
+    # Per-slot mean; NaN where nothing has been recorded
+    def mean(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.total / self.count
+
+    # Per-slot population variance; NaN where nothing has been recorded
+    def variance(self):
+        mean = self.mean()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = self.total_sq / self.count - mean * mean
+        return np.maximum(var, 0.0)
+
+    def std(self):
+        return np.sqrt(self.variance())
+
+
+# -------------------------------
+# Per-day rollup cube
+# -------------------------------
+# Partial aggregates per (day, slot) in growable (days x slots) arrays; the
+# weekday is derived from the day number. Responses update one cell, and
+# heatmaps/trends only read the rows of the requested window, so their cost
+# depends on the window length, not on the number of raw responses.
+
+SECONDS_PER_DAY = 86400
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+# Days since 1970-01-01 for epoch seconds (scalar or array)
+def epoch_day(seconds):
+    return np.asarray(seconds, dtype=np.int64) // SECONDS_PER_DAY
+
+
+# Monday=0 ... Sunday=6; day 0 (1970-01-01) was a Thursday
+def weekday_of(day):
+    return (np.asarray(day) + 3) % 7
+
+
+class DailyRollup:
+    def __init__(self, n_slots=24, capacity=64):
+        self.n_slots = n_slots
+        self.first_day = None  # day number of row 0
+        self.n_days = 0
+        self._allocate(capacity)
+        self._lock = threading.Lock()
+
+    def _allocate(self, capacity):
+        self.count = np.zeros((capacity, self.n_slots), dtype=np.int32)
+        self.total = np.zeros((capacity, self.n_slots), dtype=np.float64)
+        self.total_sq = np.zeros((capacity, self.n_slots), dtype=np.float64)
+
+    # Make rows exist for days lo..hi, growing the arrays (and shifting them
+    # when older days are backfilled)
+    def _cover(self, lo, hi):
+        if self.first_day is None:
+            self.first_day = lo
+        first = min(self.first_day, lo)
+        n_days = max(self.first_day + self.n_days, hi + 1) - first
+        shift = self.first_day - first
+        if n_days > len(self.count) or shift:
+            old = (self.count, self.total, self.total_sq)
+            self._allocate(max(n_days, 2 * len(self.count)) if n_days > len(self.count) else len(self.count))
+            for new, prev in zip((self.count, self.total, self.total_sq), old):
+                new[shift:shift + self.n_days] = prev[:self.n_days]
+        self.first_day = first
+        self.n_days = n_days
+
+    @classmethod
+    def from_arrays(cls, timestamps, slots, energies, n_slots=24):
+        rollup = cls(n_slots)
+        rollup.add_many(timestamps, slots, energies)
+        return rollup
+
+    def add(self, timestamp, slot, energy):
+        day = int(timestamp) // SECONDS_PER_DAY
+        with self._lock:
+            self._cover(day, day)
+            row = day - self.first_day
+            self.count[row, slot] += 1
+            self.total[row, slot] += energy
+            self.total_sq[row, slot] += energy * energy
+
+    def add_many(self, timestamps, slots, energies):
+        days = epoch_day(timestamps)
+        if not len(days):
+            return
+        slots = np.asarray(slots, dtype=np.int64)
+        energies = np.asarray(energies, dtype=np.float64)
+        with self._lock:
+            self._cover(int(days.min()), int(days.max()))
+            cells = (days - self.first_day) * self.n_slots + slots
+            size = self.n_days * self.n_slots
+            flat = (self.count.reshape(-1), self.total.reshape(-1), self.total_sq.reshape(-1))
+            flat[0][:size] += np.bincount(cells, minlength=size).astype(np.int32)
+            flat[1][:size] += np.bincount(cells, weights=energies, minlength=size)
+            flat[2][:size] += np.bincount(cells, weights=energies * energies, minlength=size)
+
+    @property
+    def empty(self):
+        return self.n_days == 0
+
+    @property
+    def last_day(self):
+        return None if self.first_day is None else self.first_day + self.n_days - 1
+
+    # Rows for the last `days` days ending at end_day (default: latest day)
+    def _window(self, days=None, end_day=None):
+        end_day = self.last_day if end_day is None else end_day
+        stop = min(end_day - self.first_day + 1, self.n_days)
+        start = 0 if days is None else max(stop - days, 0)
+        return start, max(stop, start)
+
+    # Day numbers in the window, as datetime64[D]
+    def dates(self, days=None, end_day=None):
+        if self.empty:
+            return np.array([], dtype="datetime64[D]")
+        start, stop = self._window(days, end_day)
+        return np.arange(self.first_day + start, self.first_day + stop).astype("datetime64[D]")
+
+    # (7, n_slots) mean energy by weekday and slot over the window; NaN where empty
+    def weekday_means(self, days=None, end_day=None):
+        count = np.zeros((7, self.n_slots), dtype=np.int64)
+        total = np.zeros((7, self.n_slots))
+        if not self.empty:
+            start, stop = self._window(days, end_day)
+            weekdays = weekday_of(np.arange(self.first_day + start, self.first_day + stop))
+            np.add.at(count, weekdays, self.count[start:stop])
+            np.add.at(total, weekdays, self.total[start:stop])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return total / count
+
+    # Per-day mean energy over the window and its trailing `rolling`-day mean
+    # (weighted by response count); NaN on days without responses
+    def daily_trend(self, days=None, rolling=7, end_day=None):
+        if self.empty:
+            return np.array([]), np.array([])
+        start, stop = self._window(days, end_day)
+        count = self.count[start:stop].sum(axis=1)
+        total = self.total[start:stop].sum(axis=1)
+        count_cs = np.concatenate(([0], np.cumsum(count)))
+        total_cs = np.concatenate(([0.0], np.cumsum(total)))
+        lo = np.maximum(np.arange(len(count)) + 1 - rolling, 0)
+        hi = np.arange(1, len(count) + 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return total / count, (total_cs[hi] - total_cs[lo]) / (count_cs[hi] - count_cs[lo])
+
+
+# -------------------------------
+# Online energy curve estimator
+# -------------------------------
+# Per-slot exponentially weighted mean of the responses, updated in O(1) per
+# response. A slot's first responses are averaged (step 1/n) until the step
+# reaches alpha, so early estimates are not dominated by a single reading.
+# curve() blends the estimate with a prior curve (e.g. the nearest simulated
+# profile), weighting the prior like `prior_weight` responses; slots without
+# responses fall back to the prior entirely.
+
+DEFAULT_ALPHA = 0.1
+DEFAULT_PRIOR_WEIGHT = 3.0
+
+
+class EnergyCurve:
+    def __init__(self, n_slots=24, alpha=DEFAULT_ALPHA, prior_weight=DEFAULT_PRIOR_WEIGHT):
+        self.n_slots = n_slots
+        self.alpha = alpha
+        self.prior_weight = prior_weight
+        self.count = np.zeros(n_slots, dtype=np.int64)
+        self.value = np.zeros(n_slots, dtype=np.float64)
+        self._lock = threading.Lock()
+
+    # Replay existing (slot, energy) columns, in order
+    @classmethod
+    def from_arrays(cls, slots, energies, n_slots=24, **kwargs):
+        curve = cls(n_slots, **kwargs)
+        curve.add_many(slots, energies)
+        return curve
+
+    def add(self, slot, energy):
+        with self._lock:
+            self.count[slot] += 1
+            step = max(1.0 / self.count[slot], self.alpha)
+            self.value[slot] += step * (energy - self.value[slot])
+
+    # Same result as calling add() for every response in order: per slot, the
+    # new value is decay * old + sum(step_i * later_decay_i * energy_i)
+    def add_many(self, slots, energies):
+        slots = np.asarray(slots, dtype=np.int64)
+        energies = np.asarray(energies, dtype=np.float64)
+        order = np.argsort(slots, kind="stable")
+        bounds = np.searchsorted(slots[order], np.arange(self.n_slots + 1))
+        with self._lock:
+            for slot in range(self.n_slots):
+                x = energies[order[bounds[slot]:bounds[slot + 1]]]
+                if not len(x):
+                    continue
+                n = self.count[slot] + np.arange(1, len(x) + 1)
+                step = np.maximum(1.0 / n, self.alpha)
+                keep = np.cumprod((1.0 - step)[::-1])[::-1]  # keep[i]: decay from response i onward
+                later = np.append(keep[1:], 1.0)
+                self.value[slot] = keep[0] * self.value[slot] + np.dot(step * later, x)
+                self.count[slot] += len(x)
+
+    @property
+    def empty(self):
+        return not self.count.any()
+
+    # Number of responses each slot's estimate is effectively worth
+    def weight(self):
+        return np.minimum(self.count, (2.0 - self.alpha) / self.alpha)
+
+    # Blended per-slot curve; without a prior, NaN where nothing was recorded
+    def curve(self, prior=None):
+        weight = self.weight()
+        if prior is None:
+            return np.where(self.count > 0, self.value, np.nan)
+        prior = np.asarray(prior, dtype=np.float64)
+        return (self.prior_weight * prior + weight * self.value) / (self.prior_weight + weight)
@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from scheduler import optimize_schedule, schedule_tasks
+from simulation import PROFILES, simulate_day
+
+# -------------------------------
+# Headless batch scheduling
+# -------------------------------
+# Reads user-days from a CSV or Parquet file, schedules them on a process
+# pool and streams one JSON line per user-day to the output file.
+#
+# Input columns:
+#   user_id  - any identifier, copied to the output
+#   tasks    - JSON list of {"specific": ..., "duration": ...[, "energy": ...]}
+#              objects; blocks below a task's energy level are flagged
+#              "below_requirement" but still used
+#   energy   - space-separated energy values, one per slot
+#   profile  - simulated profile name, used when energy is empty
+#   seed     - optional seed for the simulated profile
+#
+# A row that cannot be scheduled (bad tasks JSON, unknown profile, energy of
+# the wrong length, ...) produces {"user_id": ..., "error": "..."} instead of
+# stopping the run.
+#
+#   python batch.py users.csv schedules.jsonl --workers 8
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def _missing(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _parse_energy(row, slots_per_day):
+    energy = row.get("energy")
+    if isinstance(energy, str) and energy.strip():
+        energy = energy.split()
+    if isinstance(energy, (list, tuple, np.ndarray)):
+        try:
+            values = np.asarray(energy, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError("energy values must be numbers") from None
+        if values.shape != (slots_per_day,):
+            raise ValueError(f"expected {slots_per_day} energy values, got {values.size}")
+        if not np.isfinite(values).all():
+            raise ValueError("energy values must be finite")
+        return values
+    profile = row.get("profile")
+    if _missing(profile):
+        raise ValueError("no energy values and no profile")
+    if profile not in PROFILES:
+        raise ValueError(f"no energy values and unknown profile {profile!r}")
+    seed = row.get("seed")
+    try:
+        seed = None if _missing(seed) else int(seed)
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid seed {seed!r}") from None
+    return simulate_day(profile, slots_per_day=slots_per_day, seed=seed)
+
+
+def _parse_tasks(row):
+    tasks = row.get("tasks")
+    if isinstance(tasks, str):
+        try:
+            tasks = json.loads(tasks) if tasks.strip() else []
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"tasks is not valid JSON ({exc.msg})") from None
+    tasks = [] if _missing(tasks) else tasks
+    if not isinstance(tasks, (list, tuple)):
+        raise ValueError("tasks must be a list")
+    for i, task in enumerate(tasks, start=1):
+        if not isinstance(task, dict) or not isinstance(task.get("specific"), str):
+            raise ValueError(f"task #{i} needs a 'specific' name")
+        duration = task.get("duration")
+        if (isinstance(duration, bool) or not isinstance(duration, (int, float))
+                or not np.isfinite(duration) or duration < 0):
+            raise ValueError(f"task #{i} needs a non-negative 'duration'")
+        energy = task.get("energy")
+        if energy is not None and (isinstance(energy, bool) or not isinstance(energy, (int, float))):
+            raise ValueError(f"task #{i} has a non-numeric 'energy'")
+    return list(tasks)
+
+
+def _user_id(row):
+    user_id = row.get("user_id")
+    return None if _missing(user_id) else user_id
+
+
+# Schedule one user-day given as a dict of input columns; raises ValueError
+# for rows that cannot be scheduled
+def schedule_row(row, slots_per_hour=1, greedy=False):
+    energy = _parse_energy(row, 24 * slots_per_hour)
+    tasks = _parse_tasks(row)
+    if greedy:
+        schedule = schedule_tasks(energy, tasks, slots_per_hour)
+    else:
+        schedule = optimize_schedule(energy, tasks, slots_per_hour)
+    return {"user_id": _user_id(row), "schedule": schedule}
+
+
+# JSON line for one row: its schedule, or the reason it was rejected
+def _row_line(row, slots_per_hour, greedy):
+    try:
+        result = schedule_row(row, slots_per_hour, greedy)
+    except ValueError as exc:
+        result = {"user_id": _user_id(row), "error": str(exc)}
+    return json.dumps(result, default=int, allow_nan=False) + "\n"
+
+
+# Worker entry point: schedule a chunk of rows and return the JSON lines,
+# so only compact strings cross the process boundary
+def _schedule_chunk(rows, slots_per_hour, greedy):
+    return "".join(_row_line(row, slots_per_hour, greedy) for row in rows)
+
+
+# Input file as an iterator of lists of row dicts, chunk_size rows at a time
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Reading Parquet input requires pyarrow (pip install pyarrow).")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+    else:
+        import pandas as pd
+        # Ids stay text: no "00123" -> 123, and no 7 -> 7.0 in chunks with a blank id
+        dtypes = {"user_id": str, "energy": str, "tasks": str}
+        for frame in pd.read_csv(path, chunksize=chunk_size, dtype=dtypes):
+            yield frame.to_dict("records")
+
+
+# Schedule every row of input_path into output_path (JSON lines). Returns
+# the number of user-days written.
+def run_batch(input_path, output_path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+              slots_per_hour=1, greedy=False):
+    workers = workers or os.cpu_count() or 1
+    written = 0
+    with open(output_path, "w") as out:
+        if workers == 1:
+            for rows in read_chunks(input_path, chunk_size):
+                out.write(_schedule_chunk(rows, slots_per_hour, greedy))
+                written += len(rows)
+            return written
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Keep a bounded number of chunks in flight so memory stays flat
+            pending = []
+            for rows in read_chunks(input_path, chunk_size):
+                pending.append((len(rows), pool.submit(_schedule_chunk, rows, slots_per_hour, greedy)))
+                if len(pending) >= 2 * workers:
+                    n, future = pending.pop(0)
+                    out.write(future.result())
+                    written += n
+            for n, future in pending:
+                out.write(future.result())
+                written += n
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule tasks for many user-days without the Streamlit UI.")
+    parser.add_argument("input", help="CSV or Parquet file of user-days")
+    parser.add_argument("output", help="output JSON lines file")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per worker task")
+    parser.add_argument("--slots-per-hour", type=int, default=1, help="energy slots per hour (4 for 15-minute slots)")
+    parser.add_argument("--greedy", action="store_true", help="use greedy placement instead of the optimal scheduler")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    written = run_batch(args.input, args.output, workers=args.workers, chunk_size=args.chunk_size,
+                        slots_per_hour=args.slots_per_hour, greedy=args.greedy)
+    elapsed = time.perf_counter() - start
+    rate = written / elapsed * 60 if elapsed else float("inf")
+    print(f"Scheduled {written} user-days in {elapsed:.2f}s ({rate:,.0f} per minute)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
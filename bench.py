@@ -0,0 +1,305 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from aggregates import EnergyCurve, SlotAggregate
+from charts import animation_frames
+from scheduler import IncrementalSchedule, best_window, optimize_schedule, robust_schedule, schedule_tasks
+from simulation import profile_samples, simulate_all, simulate_day
+from task_catalog import CatalogTask, TaskCatalog, default_catalog
+
+# -------------------------------
+# Benchmark suite
+# -------------------------------
+# Runs without a Streamlit server. Each case reports the best wall time over
+# several repeats; results are written as JSON and can be compared against a
+# stored baseline:
+#
+#   python bench.py run --output baseline.json
+#   python bench.py run --output current.json
+#   python bench.py compare baseline.json current.json --threshold 1.25
+
+DEFAULT_THRESHOLD = 1.25  # current / baseline ratio that counts as a regression
+
+_CASES = []
+
+
+# Register fn(size) as a benchmark case for every size; sizes marked as
+# large are skipped with --quick
+def case(group, sizes, large=()):
+    def register(fn):
+        for size in sizes:
+            _CASES.append((f"{group}[{size}]", fn, size, size in large))
+        return fn
+    return register
+
+
+def _energy(n_slots, seed=0):
+    return np.round(np.random.default_rng(seed).uniform(1, 4, n_slots), 1)
+
+
+def _tasks(n_tasks, seed=0):
+    rng = np.random.default_rng(seed)
+    tasks = [{"specific": "Sleep", "duration": 8}]
+    tasks += [{"specific": f"task {i}", "duration": int(d)} for i, d in enumerate(rng.integers(1, 5, n_tasks - 1))]
+    return tasks[:n_tasks]
+
+
+@case("window_scoring", [24, 96, 672])
+def bench_window_scoring(n_slots):
+    energy = _energy(n_slots)
+    free = np.ones(n_slots, dtype=bool)
+    free[n_slots // 3:n_slots // 2] = False
+    return lambda: best_window(energy, free, max(1, n_slots // 12))
+
+
+@case("schedule_optimal", [1, 5, 10, 25, 50])
+def bench_schedule_optimal(n_tasks):
+    energy, tasks = np.repeat(_energy(24), 4), _tasks(n_tasks)
+    return lambda: optimize_schedule(energy, tasks, slots_per_hour=4)
+
+
+# Quarter-hour durations from 15 minutes to 4 hours, so up to 16 distinct
+# lengths: 5 and 20 tasks still run the DP, 50 exceed its state budget and
+# take the greedy-plus-repair fallback
+def _mixed_tasks(n_tasks, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{"specific": f"task {i}", "duration": d / 4, "energy": int(e)}
+            for i, (d, e) in enumerate(zip(rng.integers(1, 17, n_tasks), rng.integers(1, 5, n_tasks)))]
+
+
+@case("schedule_mixed", [5, 20, 50])
+def bench_schedule_mixed(n_tasks):
+    energy, tasks = np.repeat(_energy(24), 4), _mixed_tasks(n_tasks)
+    return lambda: optimize_schedule(energy, tasks, slots_per_hour=4)
+
+
+@case("schedule_greedy", [1, 5, 10, 25, 50])
+def bench_schedule_greedy(n_tasks):
+    energy, tasks = np.repeat(_energy(24), 4), _tasks(n_tasks)
+    return lambda: schedule_tasks(energy, tasks, slots_per_hour=4)
+
+
+@case("schedule_robust", [24, 96])
+def bench_schedule_robust(n_slots):
+    samples = profile_samples("Multiple spikes and valleys", 2000, slots_per_day=n_slots, seed=0)
+    tasks = _tasks(10)
+    return lambda: robust_schedule(samples, tasks, slots_per_hour=n_slots // 24)
+
+
+# Adding one task to (and removing it from) a schedule, against rebuilding it
+# greedily. Sizes are calendars in slots, mapped to (slots per hour, tasks):
+# 96 is a day of 15-minute slots, 10080 a week of one-minute slots.
+_CALENDARS = {96: (4, 3), 10080: (60, 50)}
+
+
+@case("reschedule_incremental", [96, 10080])
+def bench_reschedule_incremental(n_slots):
+    energy, (slots_per_hour, n_tasks) = _energy(n_slots), _CALENDARS[n_slots]
+    tasks = _tasks(n_tasks)
+    schedule = IncrementalSchedule.from_recommendations(energy, tasks, schedule_tasks(energy, tasks, slots_per_hour),
+                                                        slots_per_hour)
+
+    def run():
+        schedule.add({"specific": "extra", "duration": 2})
+        schedule.remove(len(schedule.tasks) - 1)
+    return run
+
+
+@case("reschedule_full", [96, 10080])
+def bench_reschedule_full(n_slots):
+    energy, (slots_per_hour, n_tasks) = _energy(n_slots), _CALENDARS[n_slots]
+    tasks = _tasks(n_tasks) + [{"specific": "extra", "duration": 2}]
+    return lambda: schedule_tasks(energy, tasks, slots_per_hour)
+
+
+# Type-ahead queries against the bundled catalog padded with synthetic tasks
+@case("catalog_search", [1_000, 10_000])
+def bench_catalog_search(n_tasks):
+    rng = np.random.default_rng(0)
+    words = ["focus", "review", "practice", "plan", "write", "read", "train", "clean", "call", "draft"]
+    extra = [CatalogTask(f"Category {i % 20}", f"Group {i % 200}", " ".join(rng.choice(words, 3)) + f" {i}", 1, 2)
+             for i in range(n_tasks)]
+    catalog = TaskCatalog(default_catalog().tasks + extra)
+    queries = ["s", "st", "stu", "pr", "pra", "plan wr", "zzz"]
+    return lambda: [catalog.search(query) for query in queries]
+
+
+@case("aggregate_build", [1_000, 100_000, 1_000_000, 10_000_000], large=(10_000_000,))
+def bench_aggregate_build(n_responses):
+    rng = np.random.default_rng(0)
+    hours = rng.integers(0, 24, n_responses).astype(np.int8)
+    energies = rng.integers(1, 5, n_responses).astype(np.int8)
+    return lambda: SlotAggregate.from_arrays(hours, energies)
+
+
+@case("aggregate_add", [1_000])
+def bench_aggregate_add(n_responses):
+    agg = SlotAggregate()
+
+    def run():
+        for i in range(n_responses):
+            agg.add(i % 24, 3)
+    return run
+
+
+@case("curve_build", [1_000, 100_000, 1_000_000])
+def bench_curve_build(n_responses):
+    rng = np.random.default_rng(0)
+    hours = rng.integers(0, 24, n_responses).astype(np.int8)
+    energies = rng.integers(1, 5, n_responses).astype(np.int8)
+    return lambda: EnergyCurve.from_arrays(hours, energies)
+
+
+@case("curve_add", [1_000])
+def bench_curve_add(n_responses):
+    curve = EnergyCurve()
+
+    def run():
+        for i in range(n_responses):
+            curve.add(i % 24, 3)
+    return run
+
+
+@case("simulate_day", [24, 96])
+def bench_simulate_day(slots_per_day):
+    rng = np.random.default_rng(0)
+    return lambda: simulate_day("Morning person", slots_per_day=slots_per_day, seed=rng)
+
+
+@case("simulate_all", [1_000, 10_000], large=(10_000,))
+def bench_simulate_all(users):
+    return lambda: simulate_all(users=users, days=7, slots_per_day=96, seed=0)
+
+
+@case("animation_frames", [24, 96, 672])
+def bench_animation_frames(n_slots):
+    energy = _energy(n_slots)
+    return lambda: animation_frames(energy, max_frames=24)
+
+
+@case("animation_figure", [24, 96, 672])
+def bench_animation_figure(n_slots):
+    import figures
+    energy = _energy(n_slots)
+    return lambda: figures.simulation_figure(animation_frames(energy, max_frames=24), "benchmark")
+
+
+# Imports each entry point pays before it can render, measured in a fresh
+# interpreter. "eager" is what app.py used to import up front for every tab.
+_STARTUP_IMPORTS = {
+    "eager": "import streamlit, pandas, plotly.express, numpy, streamlit.components.v1",
+    "app_core": "import streamlit, aggregates, energy_log, metrics, tabs",
+    "energy_tracker": "import streamlit, aggregates, energy_log, metrics, tabs.energy_tracker",
+    "energy_graph": "import streamlit, aggregates, energy_log, metrics, tabs.energy_graph, figures",
+    "task_scheduler": "import streamlit, aggregates, energy_log, metrics, tabs.task_scheduler, figures",
+    "chat_bot": "import streamlit, aggregates, energy_log, metrics, tabs.chat_bot",
+}
+
+
+@case("startup", list(_STARTUP_IMPORTS))
+def bench_startup(entry):
+    command = [sys.executable, "-c", _STARTUP_IMPORTS[entry]]
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    return lambda: subprocess.run(command, cwd=cwd, check=True, stderr=subprocess.DEVNULL)
+
+
+# Best time of `repeat` runs; fast functions are looped so each run takes
+# at least min_time seconds
+def measure(fn, repeat=5, min_time=0.05):
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return min(times), number
+
+
+def run(pattern=None, quick=False, repeat=5):
+    results = {}
+    for name, factory, size, large in _CASES:
+        if (pattern and pattern not in name) or (quick and large):
+            continue
+        try:
+            fn = factory(size)
+        except ImportError as exc:
+            print(f"{name:32s} skipped ({exc})", file=sys.stderr)
+            continue
+        seconds, number = measure(fn, repeat=repeat)
+        results[name] = {"seconds": seconds, "number": number}
+        print(f"{name:32s} {seconds * 1e3:12.4f} ms", file=sys.stderr)
+    return {
+        "meta": {"python": platform.python_version(), "numpy": np.__version__,
+                 "machine": platform.machine(), "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+# Rows of (name, baseline s, current s, ratio, regressed) for every baseline
+# case. A case missing from the current run (it crashed, was skipped or was
+# removed) has current s and ratio None and counts as a regression.
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    rows = []
+    for name, base in baseline["results"].items():
+        entry = current["results"].get(name)
+        if entry is None:
+            rows.append((name, base["seconds"], None, None, True))
+            continue
+        ratio = entry["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+        rows.append((name, base["seconds"], entry["seconds"], ratio, ratio > threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scheduler, aggregation, simulation and charts.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", help="write results to this JSON file")
+    run_parser.add_argument("--filter", help="only run cases whose name contains this text")
+    run_parser.add_argument("--quick", action="store_true", help="skip the largest sizes")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run(args.filter, args.quick, args.repeat)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows = compare(baseline, current, args.threshold)
+    for name, base, cur, ratio, regressed in rows:
+        if cur is None:
+            print(f"{name:32s} {base * 1e3:12.4f} ms {'-':>12s}    {'-':>7s}  MISSING")
+            continue
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:32s} {base * 1e3:12.4f} ms {cur * 1e3:12.4f} ms {ratio:7.2f}x {flag}")
+    return 1 if any(row[-1] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from energy_log import COLUMNS, DEFAULT_LOG_PATH, DEFAULT_USER, read_records, store_records
+
+# -------------------------------
+# Streaming bulk import/export of energy logs
+# -------------------------------
+# Files are read and written in fixed-size chunks, so memory stays bounded by
+# the chunk size rather than the file or log size: imported chunks go
+# straight to the database and exports stream out of it. Imported rows are
+# coerced into
+# the log's (timestamp, hour, energy) schema:
+#   timestamp - date strings pd.to_datetime parses, or a numeric column of
+#               Unix epoch seconds; values with a UTC offset or zone (Z, GMT,
+#               +02:00) keep their wall-clock time in it (the offset is
+#               dropped, not converted), matching the naive local times the
+#               tracker records
+#   hour      - optional, taken from the timestamp when missing or blank; 0-23
+#               and must fit the log's uint32 epoch seconds (1970-2106)
+#   energy    - numeric, rounded to the nearest level; 1-4
+# Rows that do not fit are counted and skipped.
+#
+#   python bulk_io.py import history.csv --user alice
+#   python bulk_io.py export energy.parquet --user alice
+
+DEFAULT_CHUNK_SIZE = 500_000
+MIN_LEVEL, MAX_LEVEL = 1, 4
+MAX_SECONDS = 2 ** 32  # timestamps are stored as uint32 epoch seconds
+
+
+def _is_parquet(path):
+    return isinstance(path, str) and path.endswith(".parquet")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("Parquet files require pyarrow (pip install pyarrow).")
+    return pyarrow
+
+
+# Raw chunks of the input as DataFrames; source is a path or file-like (CSV)
+def read_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    if _is_parquet(source):
+        pq = _pyarrow().parquet
+        parquet = pq.ParquetFile(source)
+        columns = [c for c in COLUMNS if c in parquet.schema_arrow.names]
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_size, usecols=lambda c: c in COLUMNS)
+
+
+# Trailing "Z" / "+02:00" / "-0500" after a time of day
+_OFFSET = r"(\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)\s*(?:Z|[+-]\d{2}:?\d{2})$"
+
+
+def _wall_clock(value):
+    stamp = pd.to_datetime(value, errors="coerce", format="mixed")
+    return stamp if stamp is pd.NaT or stamp.tzinfo is None else stamp.tz_localize(None)
+
+
+# Naive wall-clock timestamps from free-form date strings. Values that carry
+# a zone pandas only recognizes here (GMT, CET, ...) come back tz-aware, and
+# several different zones in one batch cannot be parsed together at all, so
+# those are parsed one by one.
+def _parse_mixed(text):
+    try:
+        stamps = pd.to_datetime(text, errors="coerce", format="mixed")
+    except ValueError:  # mixed time zones
+        return pd.to_datetime(text.map(_wall_clock, na_action="ignore"))
+    if isinstance(stamps.dtype, pd.DatetimeTZDtype):
+        stamps = stamps.dt.tz_localize(None)
+    return stamps
+
+
+# Naive wall-clock timestamps. ISO 8601 is parsed vectorized; only values
+# that fail fall back to the slower free-form parser. Numbers are epoch
+# seconds; out-of-range ones become NaT and are rejected.
+def _parse_timestamps(raw):
+    if isinstance(raw.dtype, pd.DatetimeTZDtype):
+        return raw.dt.tz_localize(None)
+    if pd.api.types.is_datetime64_dtype(raw.dtype):
+        return raw
+    if pd.api.types.is_numeric_dtype(raw.dtype) and not pd.api.types.is_bool_dtype(raw.dtype):
+        return pd.to_datetime(raw.where(raw.between(0, MAX_SECONDS - 1)), unit="s")
+    text = raw.astype("string").str.strip().str.replace(_OFFSET, r"\1", regex=True)
+    stamps = pd.to_datetime(text, errors="coerce", format="ISO8601")
+    retry = stamps.isna() & text.notna()
+    if retry.any():
+        stamps[retry] = _parse_mixed(text[retry])
+    return stamps
+
+
+# Coerce one raw chunk into (timestamps, hours, energies) arrays plus the
+# number of rejected rows
+def coerce_chunk(frame):
+    if "timestamp" not in frame or "energy" not in frame:
+        raise ValueError("energy log files need 'timestamp' and 'energy' columns")
+    stamps = _parse_timestamps(frame["timestamp"])
+    energy = pd.to_numeric(frame["energy"], errors="coerce").round()
+    hour = stamps.dt.hour
+    if "hour" in frame:
+        hour = pd.to_numeric(frame["hour"], errors="coerce").fillna(hour)
+    seconds = stamps.to_numpy().astype("datetime64[s]").astype(np.int64)  # NaT becomes int64 min
+    valid = ((seconds >= 0) & (seconds < MAX_SECONDS) & (energy.between(MIN_LEVEL, MAX_LEVEL)
+             & hour.between(0, 23) & (hour == hour.round())).to_numpy())
+    return (seconds[valid],
+            hour[valid].to_numpy().astype(np.int8),
+            energy[valid].to_numpy().astype(np.int8),
+            int((~valid).sum()))
+
+
+# Stream a file into user_id's stored log, keeping the hourly aggregate,
+# per-day rollup and energy curve (when given) in step. Each chunk is written
+# straight to the database; pass an open EnergyLog as `log` only when its
+# columns must hold the rows too (they are then written through it and
+# user_id/path are ignored). Returns {"imported": n, "rejected": n}.
+def import_file(source, user_id=DEFAULT_USER, path=DEFAULT_LOG_PATH, hourly=None, rollup=None, curve=None,
+                log=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    imported = rejected = 0
+    for frame in read_chunks(source, chunk_size):
+        seconds, hours, energies, bad = coerce_chunk(frame)
+        if log is not None:
+            log.extend(seconds, hours, energies)
+        else:
+            store_records(seconds, hours, energies, user_id, path)
+        if hourly is not None:
+            hourly.add_many(hours, energies)
+        if rollup is not None:
+            rollup.add_many(seconds, hours, energies)
+        if curve is not None:
+            curve.add_many(hours, energies)
+        imported += len(seconds)
+        rejected += bad
+    if log is not None:
+        log.flush()
+    return {"imported": imported, "rejected": rejected}
+
+
+def _export_chunks(user_id, path, chunk_size):
+    empty = True
+    for chunk in read_records(user_id, path, chunk_size):
+        empty = False
+        yield chunk
+    if empty:  # still write the header / schema
+        yield np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.int8)
+
+
+# Write user_id's stored log to a CSV or Parquet target, chunk_size rows at
+# a time. Returns the number of rows written.
+def export_file(target, user_id=DEFAULT_USER, path=DEFAULT_LOG_PATH, chunk_size=DEFAULT_CHUNK_SIZE):
+    n = 0
+    writer = None
+    try:
+        for i, (timestamps, hours, energies) in enumerate(_export_chunks(user_id, path, chunk_size)):
+            frame = pd.DataFrame({
+                "timestamp": pd.to_datetime(timestamps.astype(np.int64), unit="s"),
+                "hour": hours,
+                "energy": energies,
+            })
+            if _is_parquet(target):
+                pa = _pyarrow()
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pa.parquet.ParquetWriter(target, table.schema)
+                writer.write_table(table)
+            else:
+                frame.to_csv(target, mode="w" if i == 0 else "a", header=i == 0, index=False)
+            n += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import or export the energy log.")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path", help="CSV or Parquet file")
+    parser.add_argument("--user", default=DEFAULT_USER, help="user whose log is imported into or exported")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        stats = import_file(args.path, args.user, chunk_size=args.chunk_size)
+        print(f"Imported {stats['imported']} rows, rejected {stats['rejected']}", file=sys.stderr)
+    else:
+        written = export_file(args.path, args.user, chunk_size=args.chunk_size)
+        print(f"Exported {written} rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import hashlib
+import json
+
+import numpy as np
+import streamlit as st
+
+from scheduler import optimize_schedule, robust_schedule
+
+# -------------------------------
+# Cross-rerun caches
+# -------------------------------
+# Expensive results are cached process-wide (shared by every session) and
+# keyed by a content hash of their inputs, so an unchanged energy curve and
+# task list never reschedule or rebuild a figure. Every cache is bounded and
+# evicts least-recently-used entries, which keeps memory flat no matter how
+# many sessions are open. The raw inputs are passed as underscore arguments
+# so Streamlit skips hashing them and uses only the content key.
+
+CACHE_ENTRIES = 256
+
+
+def _update(digest, part):
+    if isinstance(part, (np.ndarray, range)):
+        part = np.asarray(part)
+        digest.update(str((part.dtype.str, part.shape)).encode())
+        digest.update(np.ascontiguousarray(part).tobytes())
+    elif hasattr(part, "to_dict"):
+        _update(digest, part.to_dict())
+    elif isinstance(part, dict):
+        digest.update(b"{")
+        for name in sorted(part, key=str):
+            _update(digest, name)
+            _update(digest, part[name])
+        digest.update(b"}")
+    elif isinstance(part, (list, tuple)):
+        digest.update(b"[")
+        for item in part:
+            _update(digest, item)
+        digest.update(b"]")
+    else:
+        digest.update(json.dumps(part, default=str).encode())
+    digest.update(b"\0")
+
+
+# Stable hash of arrays, dicts/lists of them and plain scalars
+def content_hash(*parts):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update(digest, part)
+    return digest.hexdigest()
+
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def _schedule(key, _energy, _tasks, slots_per_hour):
+    return optimize_schedule(_energy, _tasks, slots_per_hour)
+
+
+def cached_schedule(energy, tasks, slots_per_hour=1):
+    energy = np.asarray(energy, dtype=np.float64)
+    return _schedule(content_hash(energy, tasks, slots_per_hour), energy, tasks, slots_per_hour)
+
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def _robust_schedule(key, _samples, _tasks, slots_per_hour):
+    return robust_schedule(_samples, _tasks, slots_per_hour)
+
+
+def cached_robust_schedule(samples, tasks, slots_per_hour=1):
+    samples = np.asarray(samples, dtype=np.float64)
+    return _robust_schedule(content_hash(samples, tasks, slots_per_hour), samples, tasks, slots_per_hour)
+
+
+# Figures are cached as resources: the same object is handed to every rerun,
+# which avoids rebuilding and unpickling them. Callers must not mutate them.
+@st.cache_resource(max_entries=CACHE_ENTRIES, show_spinner=False)
+def _figure(key, builder, _args):
+    import figures  # plotly is only loaded once a figure is needed
+    return getattr(figures, builder)(*_args)
+
+
+# builder is the name of a function in figures.py
+def cached_figure(builder, *args):
+    return _figure(content_hash(builder, *args), builder, args)
@@ -0,0 +1,35 @@
+import numpy as np
+
+# -------------------------------
+# Chart data helpers
+# -------------------------------
+
+DEFAULT_MAX_FRAMES = 24
+
+
+# Last slot index shown in each animation frame. With n slots and no cap
+# every slot gets its own frame; otherwise frames are spread evenly and the
+# final frame always shows the whole curve.
+def frame_cutoffs(n_slots, max_frames=DEFAULT_MAX_FRAMES):
+    if n_slots <= 0:
+        return np.zeros(0, dtype=np.int64)
+    n_frames = n_slots if not max_frames else min(n_slots, max_frames)
+    cutoffs = np.ceil(np.arange(1, n_frames + 1) * (n_slots / n_frames)).astype(np.int64) - 1
+    return np.minimum(cutoffs, n_slots - 1)
+
+
+# Long-format columns for a "draw the line progressively" animation:
+# frame k contains slots 0..cutoffs[k]. x defaults to the (fractional) hour
+# of day each slot starts at, treating the curve as one day; pass x for other
+# spans. Built with repeat/cumsum index arithmetic, so the cost is linear in
+# the number of emitted rows, which the frame cap keeps at most
+# max_frames * n_slots.
+def animation_frames(energy, x=None, max_frames=DEFAULT_MAX_FRAMES):
+    energy = np.asarray(energy)
+    x = np.arange(len(energy)) * (24.0 / max(len(energy), 1)) if x is None else np.asarray(x)
+    cutoffs = frame_cutoffs(len(energy), max_frames)
+    lengths = cutoffs + 1
+    starts = np.cumsum(lengths) - lengths
+    frame = np.repeat(np.arange(len(cutoffs)), lengths)
+    slot = np.arange(lengths.sum()) - np.repeat(starts, lengths)
+    return {"hour": x[slot], "energy": energy[slot], "frame": frame}
@@ -0,0 +1,248 @@
+import atexit
+import datetime
+import functools
+import os
+import sqlite3
+import threading
+import time
+import weakref
+
+import numpy as np
+
+from aggregates import DailyRollup, EnergyCurve, SlotAggregate
+
+# -------------------------------
+# Append-only energy response log
+# -------------------------------
+# Records are (timestamp, hour, energy) for one user. They live in
+# preallocated numpy columns that double in size when full, so appends are
+# amortized O(1). Every user's records are kept in one local SQLite file,
+# tagged with a user_id column; new records are written in batches and on
+# startup only the user's rows are read back, in chunks, straight into
+# preallocated column arrays. Timestamps are uint32 epoch seconds and
+# hour/energy are int8, six bytes per record. Logs for the same file share
+# one connection, serialized by a lock; each log's columns have their own.
+
+DEFAULT_LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "energy_log.db")
+COLUMNS = ("timestamp", "hour", "energy")
+LOAD_CHUNK = 65536  # rows fetched per round trip when loading
+DEFAULT_USER = "default"  # owner of rows written before logs had a user_id
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+# Naive wall-clock datetime -> integer seconds, round-trips via pd.to_datetime(unit="s")
+def to_epoch(dt):
+    return int((dt - _EPOCH).total_seconds())
+
+
+# One connection (and the lock serializing it) per database file, shared by
+# every log and session in the process. Databases from before per-user logs
+# get a user_id column, with existing rows assigned to DEFAULT_USER.
+@functools.lru_cache(maxsize=None)
+def _connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    with conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS energy_log "
+            "(timestamp INTEGER NOT NULL, hour INTEGER NOT NULL, energy INTEGER NOT NULL, user_id TEXT NOT NULL)"
+        )
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(energy_log)")]
+        if "user_id" not in columns:
+            conn.execute(f"ALTER TABLE energy_log ADD COLUMN user_id TEXT NOT NULL DEFAULT '{DEFAULT_USER}'")
+        conn.execute("CREATE INDEX IF NOT EXISTS energy_log_user ON energy_log (user_id)")
+    return conn, threading.RLock()
+
+
+# Insert one user's records in a single transaction on the shared connection
+def _insert(path, user_id, timestamps, hours, energies):
+    conn, conn_lock = _connect(path)
+    rows = zip(np.asarray(timestamps).tolist(), np.asarray(hours).tolist(), np.asarray(energies).tolist(),
+               [user_id] * len(timestamps))
+    with conn_lock, conn:
+        conn.executemany("INSERT INTO energy_log (timestamp, hour, energy, user_id) VALUES (?, ?, ?, ?)", rows)
+
+
+# Write records straight to the database without holding them in any log's
+# columns (bulk imports). Open logs of the same user see them after a reload.
+def store_records(timestamps, hours, energies, user_id=DEFAULT_USER, path=DEFAULT_LOG_PATH):
+    _insert(path, str(user_id), timestamps, hours, energies)
+
+
+# A user's stored records as (timestamps, hours, energies) column chunks of
+# up to chunk_size rows, read on a connection of their own so a long export
+# does not hold up the shared one. Rows are fetched LOAD_CHUNK at a time.
+def read_records(user_id=DEFAULT_USER, path=DEFAULT_LOG_PATH, chunk_size=LOAD_CHUNK):
+    _connect(path)  # create or migrate the table
+    conn = sqlite3.connect(path)
+    try:
+        cursor = conn.execute("SELECT timestamp, hour, energy FROM energy_log WHERE user_id = ? ORDER BY rowid",
+                              (str(user_id),))
+        parts, size = [], 0
+        while True:
+            rows = cursor.fetchmany(min(chunk_size - size, LOAD_CHUNK))
+            if rows:
+                parts.append(np.array(rows, dtype=np.int64))
+                size += len(rows)
+            if parts and (size >= chunk_size or not rows):
+                table = np.concatenate(parts)
+                parts, size = [], 0
+                yield table[:, 0].astype(np.uint32), table[:, 1].astype(np.int8), table[:, 2].astype(np.int8)
+            if not rows:
+                break
+    finally:
+        conn.close()
+
+
+# Open logs, flushed once at exit; logs of ended sessions drop out on their own
+_OPEN_LOGS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_logs():
+    for log in list(_OPEN_LOGS):
+        log.flush()
+
+
+class EnergyLog:
+    def __init__(self, path=DEFAULT_LOG_PATH, user_id=DEFAULT_USER, capacity=1024, batch_size=64,
+                 flush_interval=5.0):
+        self.path = path
+        self.user_id = str(user_id)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._size = 0
+        self._flushed = 0
+        self._last_flush = time.monotonic()
+        self.lock = threading.RLock()
+        self._allocate(capacity)
+        if path is not None:
+            self._conn, self._conn_lock = _connect(path)
+            self._load()
+            _OPEN_LOGS.add(self)
+        else:
+            self._conn = None
+
+    def _allocate(self, capacity):
+        self._timestamp = np.empty(capacity, dtype=np.uint32)
+        self._hour = np.empty(capacity, dtype=np.int8)
+        self._energy = np.empty(capacity, dtype=np.int8)
+
+    def _grow(self, min_capacity):
+        capacity = max(min_capacity, 2 * len(self._timestamp), 16)
+        old = (self._timestamp, self._hour, self._energy)
+        self._allocate(capacity)
+        for new_col, old_col in zip((self._timestamp, self._hour, self._energy), old):
+            new_col[:self._size] = old_col[:self._size]
+
+    # Read the user's stored records into the column buffers, allocated once
+    # from the row count and filled LOAD_CHUNK rows at a time, so only one
+    # chunk of Python tuples exists at any point
+    def _load(self):
+        size = 0
+        with self._conn_lock:
+            n = self._conn.execute("SELECT COUNT(*) FROM energy_log WHERE user_id = ?", (self.user_id,)).fetchone()[0]
+            if not n:
+                return
+            if n > len(self._timestamp):
+                self._allocate(max(n * 2, 1024))
+            cursor = self._conn.execute(
+                "SELECT timestamp, hour, energy FROM energy_log WHERE user_id = ? ORDER BY rowid", (self.user_id,))
+            while size < n:
+                rows = cursor.fetchmany(LOAD_CHUNK)
+                if not rows:
+                    break
+                table = np.array(rows, dtype=np.int64)
+                end = size + len(table)
+                self._timestamp[size:end] = table[:, 0]
+                self._hour[size:end] = table[:, 1]
+                self._energy[size:end] = table[:, 2]
+                size = end
+        self._size = size
+        self._flushed = size
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def empty(self):
+        return self._size == 0
+
+    @property
+    def timestamps(self):
+        return self._timestamp[:self._size]
+
+    @property
+    def hours(self):
+        return self._hour[:self._size]
+
+    @property
+    def energies(self):
+        return self._energy[:self._size]
+
+    def append(self, timestamp, hour, energy):
+        with self.lock:
+            if self._size == len(self._timestamp):
+                self._grow(self._size + 1)
+            i = self._size
+            self._timestamp[i] = to_epoch(timestamp) if isinstance(timestamp, datetime.datetime) else int(timestamp)
+            self._hour[i] = hour
+            self._energy[i] = energy
+            self._size += 1
+            self._maybe_flush()
+
+    # Append many records at once; columns are array-likes of equal length
+    def extend(self, timestamps, hours, energies):
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        n = len(timestamps)
+        with self.lock:
+            if self._size + n > len(self._timestamp):
+                self._grow(self._size + n)
+            end = self._size + n
+            self._timestamp[self._size:end] = timestamps
+            self._hour[self._size:end] = hours
+            self._energy[self._size:end] = energies
+            self._size = end
+            self._maybe_flush()
+
+    @property
+    def pending(self):
+        return self._size - self._flushed
+
+    def _maybe_flush(self):
+        if self.pending >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    # Write all records appended since the last flush in one transaction
+    def flush(self):
+        with self.lock:
+            self._last_flush = time.monotonic()
+            if self._conn is None or self.pending == 0:
+                return
+            start, end = self._flushed, self._size
+            _insert(self.path, self.user_id, self._timestamp[start:end], self._hour[start:end],
+                    self._energy[start:end])
+            self._flushed = end
+
+    # Flush and detach; the shared connection stays open for other logs
+    def close(self):
+        self.flush()
+        self._conn = None
+        _OPEN_LOGS.discard(self)
+
+    # Snapshot as a DataFrame with the original (timestamp, hour, energy) columns
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame({
+            "timestamp": pd.to_datetime(self.timestamps.astype(np.int64), unit="s"),
+            "hour": self.hours.astype(np.int64),
+            "energy": self.energies.astype(np.int64),
+        })
+
+
+# A user's log with its hourly aggregate, per-day rollup and online energy
+# curve, built from the log's columns in one pass each
+def load_user_log(user_id, path=DEFAULT_LOG_PATH, **kwargs):
+    log = EnergyLog(path, user_id, **kwargs)
+    return (log, SlotAggregate.from_arrays(log.hours, log.energies),
+            DailyRollup.from_arrays(log.timestamps, log.hours, log.energies),
+            EnergyCurve.from_arrays(log.hours, log.energies))
@@ -0,0 +1,77 @@
+import numpy as np
+import plotly.express as px
+
+# -------------------------------
+# Plotly figure builders
+# -------------------------------
+
+SCHEDULE_COLORS = ["red", "blue", "green", "purple", "orange", "brown"]
+
+
+def _style(fig, x_max=23, **layout):
+    fig.update_layout(xaxis=dict(range=[0, x_max], dtick=1),
+                      yaxis=dict(range=[1, 4], dtick=1),
+                      plot_bgcolor='rgba(0,0,0,0)',
+                      paper_bgcolor='rgba(0,0,0,0)',
+                      **layout)
+    return fig
+
+
+# Average energy per hour with standard deviation error bars
+def hourly_energy_figure(hours, mean, std):
+    data = {"hour": hours, "energy": mean, "std": std}
+    fig = px.line(data, x="hour", y="energy", error_y="std", markers=True, title="Average Hourly Energy Levels")
+    return _style(fig)
+
+
+# Mean energy by weekday (rows) and hour (columns)
+def weekday_heatmap_figure(means, weekday_names, title):
+    fig = px.imshow(means, x=list(range(means.shape[1])), y=weekday_names, zmin=1, zmax=4,
+                    color_continuous_scale="RdYlGn", aspect="auto", title=title,
+                    labels=dict(x="hour", y="weekday", color="energy"))
+    fig.update_layout(xaxis=dict(dtick=1), plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+    return fig
+
+
+# Daily mean energy with its rolling mean
+def trend_figure(dates, daily, rolling, rolling_days, title):
+    data = {"date": list(dates) * 2, "energy": list(daily) + list(rolling),
+            "series": ["Daily mean"] * len(dates) + [f"{rolling_days}-day mean"] * len(dates)}
+    fig = px.line(data, x="date", y="energy", color="series", markers=True, title=title)
+    fig.update_layout(yaxis=dict(range=[1, 4], dtick=1),
+                      plot_bgcolor='rgba(0,0,0,0)',
+                      paper_bgcolor='rgba(0,0,0,0)')
+    return fig
+
+
+# Progressively drawn curve; frames is the output of charts.animation_frames().
+# The x-axis spans every slot's hour, so 96- and 672-slot curves are shown whole.
+def simulation_figure(frames, title):
+    fig = px.line(frames, x="hour", y="energy", markers=True, animation_frame="frame", title=title)
+    x_max = float(np.max(frames["hour"])) if len(frames["hour"]) else 23
+    return _style(fig, x_max=max(x_max, 1), transition={'duration': 10})
+
+
+# Energy curve, optionally with each scheduled block shaded (Sleep in yellow)
+def energy_figure(hours, energy, title, recommendations=()):
+    fig = px.line({"hour": hours, "energy": energy}, x="hour", y="energy", markers=True, title=title)
+    _style(fig)
+    color_index = 0
+    for rec in recommendations:
+        if rec["task"] == "Sleep" and rec["start"] is not None:
+            fig.add_shape(
+                type="rect",
+                x0=rec["start"], y0=1,
+                x1=rec["end"], y1=4,
+                fillcolor="yellow", opacity=0.3, line_width=0
+            )
+        elif rec.get("block") is not None:
+            fig.add_shape(
+                type="rect",
+                x0=rec["block"][0], y0=1,
+                x1=rec["block"][-1] + 1, y1=4,
+                fillcolor=SCHEDULE_COLORS[color_index % len(SCHEDULE_COLORS)],
+                opacity=0.3, line_width=0
+            )
+            color_index += 1
+    return fig
@@ -0,0 +1,44 @@
+import sys
+
+import numpy as np
+
+# -------------------------------
+# Per-session memory report
+# -------------------------------
+# Approximate deep size of each session_state entry, for capacity planning.
+
+
+# Deep size in bytes of obj, skipping anything whose id is already in seen
+def deep_sizeof(obj, seen=None):
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, np.ndarray):
+        # getsizeof includes the buffer for owning arrays; views count their base once
+        return size + (deep_sizeof(obj.base, seen) if obj.base is not None else 0)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    else:
+        for name in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, name):
+                size += deep_sizeof(getattr(obj, name), seen)
+        if hasattr(obj, "__dict__"):
+            size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+# Rows of {"key", "bytes"} for every entry of a session state mapping,
+# largest first
+def session_memory_report(state):
+    rows = [{"key": str(key), "bytes": deep_sizeof(state[key])} for key in list(state.keys())]
+    rows.sort(key=lambda row: row["bytes"], reverse=True)
+    return rows
+
+
+def session_bytes(report):
+    return sum(row["bytes"] for row in report)
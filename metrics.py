@@ -0,0 +1,189 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# -------------------------------
+# Timing spans and histograms
+# -------------------------------
+# Spans are cheap enough to leave on permanently: a perf_counter pair and a
+# bucket increment. Every span is recorded into the process-wide Timings
+# (shared by all sessions) and into the session's own Timings.
+
+DEFAULT_METRICS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "metrics.json")
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+EXPORT_INTERVAL = 30.0  # seconds between metrics file writes
+
+# Upper bucket edges in milliseconds; the last bucket is open-ended
+BUCKET_EDGES_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_EDGES_MS) + 1)
+
+    def add(self, ms):
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+        self.buckets[bisect_left(BUCKET_EDGES_MS, ms)] += 1
+
+    # Upper edge of the bucket holding the q-th quantile (q in 0..1), capped at the max
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(BUCKET_EDGES_MS[i], self.max) if i < len(BUCKET_EDGES_MS) else self.max
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count if self.count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": self.max,
+            "buckets": list(self.buckets),
+        }
+
+
+class Timings:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+
+    def record(self, name, ms):
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram()
+            hist.add(ms)
+
+    def summary(self):
+        with self._lock:
+            return {name: hist.summary() for name, hist in sorted(self.histograms.items())}
+
+    # One row per span without the raw buckets, for display
+    def table(self):
+        rows = []
+        for name, summary in self.summary().items():
+            summary.pop("buckets")
+            rows.append({"span": name, **summary})
+        return rows
+
+
+PROCESS_TIMINGS = Timings()
+_last_export = [0.0]
+_export_lock = threading.Lock()
+
+
+# Records spans into every target Timings. begin()/end() cover sections that
+# do not fit a with-block, such as a whole rerun or the selected tab.
+class SpanTimer:
+    def __init__(self, *targets):
+        self.targets = targets
+        self._open = {}
+
+    def _record(self, name, start):
+        ms = (time.perf_counter() - start) * 1e3
+        for target in self.targets:
+            target.record(name, ms)
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, start)
+
+    def begin(self, name):
+        self._open[name] = time.perf_counter()
+
+    def end(self, name):
+        start = self._open.pop(name, None)
+        if start is not None:
+            self._record(name, start)
+
+
+# Write the process-wide summary to path, at most once per interval. A
+# session that finds another export in progress skips it instead of waiting.
+# Each write goes to its own temporary file next to path and is renamed over
+# it, so concurrent processes never share a temporary file either.
+def export_if_due(path=DEFAULT_METRICS_PATH, interval=EXPORT_INTERVAL):
+    if not _export_lock.acquire(blocking=False):
+        return False
+    try:
+        now = time.monotonic()
+        if now - _last_export[0] < interval:
+            return False
+        _last_export[0] = now
+        data = {"pid": os.getpid(), "written": time.strftime("%Y-%m-%dT%H:%M:%S"), "spans": PROCESS_TIMINGS.summary()}
+        fd, tmp = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=".tmp",
+                                   dir=os.path.dirname(path) or ".")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        return True
+    finally:
+        _export_lock.release()
+
+
+# -------------------------------
+# Single-rerun profiling
+# -------------------------------
+# Uses pyinstrument when it is installed, cProfile otherwise. stop() returns
+# a text report and also saves the raw profile under DEFAULT_PROFILE_DIR.
+class RerunProfiler:
+    def __init__(self):
+        try:
+            from pyinstrument import Profiler
+            self._profiler = Profiler()
+            self.kind = "pyinstrument"
+        except ImportError:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self.kind = "cProfile"
+
+    def start(self):
+        if self.kind == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self, directory=DEFAULT_PROFILE_DIR, limit=30):
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        if self.kind == "pyinstrument":
+            self._profiler.stop()
+            report = self._profiler.output_text()
+            path = os.path.join(directory, f"rerun-{stamp}.txt")
+            with open(path, "w") as f:
+                f.write(report)
+        else:
+            import io
+            import pstats
+            self._profiler.disable()
+            path = os.path.join(directory, f"rerun-{stamp}.prof")
+            self._profiler.dump_stats(path)
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+            report = out.getvalue()
+        return path, report
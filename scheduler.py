@@ -0,0 +1,610 @@
+import time
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+# -------------------------------
+# Window scoring engine for the Task Scheduler
+# -------------------------------
+# The energy curve is a 1-D array with one value per slot (24 hourly slots by
+# default, 96 for 15-minute slots, 672 for a week of 15-minute slots, ...).
+# A window of `length` slots is identified by its start slot. Prefix sums make
+# every window sum an O(1) lookup, so scoring all windows is a single
+# vectorized subtraction instead of one DataFrame mask per candidate.
+
+# Window means are rounded before comparing so that float noise from the
+# prefix sums cannot break ties differently from a direct mean.
+SCORE_DECIMALS = 9
+
+
+# Prefix sums with a leading zero: sum(values[a:b]) == prefix[b] - prefix[a]
+def prefix_sums(values):
+    values = np.asarray(values, dtype=np.float64)
+    prefix = np.zeros(len(values) + 1, dtype=np.float64)
+    np.cumsum(values, out=prefix[1:])
+    return prefix
+
+
+# Mean energy of every window of `length` slots, indexed by start slot
+def window_means(energy, length, prefix=None):
+    if prefix is None:
+        prefix = prefix_sums(energy)
+    n_slots = len(prefix) - 1
+    if length <= 0 or length > n_slots:
+        return np.empty(0, dtype=np.float64)
+    return (prefix[length:] - prefix[:-length]) / length
+
+
+# Boolean array marking the windows of `length` slots that are entirely free
+def free_windows(free_mask, length):
+    free_mask = np.asarray(free_mask, dtype=bool)
+    if length <= 0 or length > len(free_mask):
+        return np.zeros(0, dtype=bool)
+    free_prefix = prefix_sums(free_mask)
+    return (free_prefix[length:] - free_prefix[:-length]) == length
+
+
+# Contiguous runs of free slots as (start, stop) pairs, stop exclusive
+def free_segments(free_mask):
+    padded = np.concatenate(([False], np.asarray(free_mask, dtype=bool), [False]))
+    edges = np.flatnonzero(np.diff(padded.astype(np.int8)))
+    return [(int(a), int(b)) for a, b in zip(edges[::2], edges[1::2])]
+
+
+# Start slot and mean of the best fully-free window, or (None, None).
+# minimize=True picks the lowest-energy window (used for Sleep).
+def best_window(energy, free_mask, length, minimize=False, prefix=None):
+    means = window_means(energy, length, prefix)
+    valid = free_windows(free_mask, length)
+    if not valid.any():
+        return None, None
+    scores = np.round(means, SCORE_DECIMALS)
+    if minimize:
+        scores = np.where(valid, scores, np.inf)
+        start = int(np.argmin(scores))
+    else:
+        scores = np.where(valid, scores, -np.inf)
+        start = int(np.argmax(scores))
+    return start, float(means[start])
+
+
+# -------------------------------
+# Free-time index
+# -------------------------------
+# Free slots as sorted, disjoint [start, stop) runs. Occupying or releasing a
+# block only splices the run(s) around it (found by bisection), and queries
+# for runs of at least k slots read the runs directly, so their cost depends
+# on the number of runs rather than on the number of slots in the calendar.
+
+class FreeTimeIndex:
+    def __init__(self, n_slots):
+        self.n_slots = n_slots
+        self.starts = [0] if n_slots else []
+        self.stops = [n_slots] if n_slots else []
+
+    @classmethod
+    def from_mask(cls, free_mask):
+        index = cls(len(free_mask))
+        segments = free_segments(free_mask)
+        index.starts = [a for a, _ in segments]
+        index.stops = [b for _, b in segments]
+        return index
+
+    # Position of the run containing slot, or -1
+    def _run_at(self, slot):
+        i = bisect_right(self.starts, slot) - 1
+        return i if i >= 0 and slot < self.stops[i] else -1
+
+    def is_free(self, start, length):
+        i = self._run_at(start)
+        return i >= 0 and start + length <= self.stops[i]
+
+    def occupy(self, start, length):
+        i = self._run_at(start)
+        if i < 0 or start + length > self.stops[i]:
+            raise ValueError(f"slots {start}-{start + length} are not free")
+        pieces = [(a, b) for a, b in ((self.starts[i], start), (start + length, self.stops[i])) if b > a]
+        self.starts[i:i + 1] = [a for a, _ in pieces]
+        self.stops[i:i + 1] = [b for _, b in pieces]
+
+    def release(self, start, length):
+        stop = start + length
+        i = bisect_left(self.starts, start)
+        if (start < 0 or stop > self.n_slots or (i > 0 and self.stops[i - 1] > start)
+                or (i < len(self.starts) and self.starts[i] < stop)):
+            raise ValueError(f"slots {start}-{stop} are not occupied")
+        merge_left = i > 0 and self.stops[i - 1] == start
+        merge_right = i < len(self.starts) and self.starts[i] == stop
+        if merge_left and merge_right:
+            self.stops[i - 1] = self.stops.pop(i)
+            del self.starts[i]
+        elif merge_left:
+            self.stops[i - 1] = stop
+        elif merge_right:
+            self.starts[i] = start
+        else:
+            self.starts.insert(i, start)
+            self.stops.insert(i, stop)
+
+    # Free runs of at least min_length slots as (start, stop) pairs
+    def runs(self, min_length=1):
+        return [(a, b) for a, b in zip(self.starts, self.stops) if b - a >= min_length]
+
+    # Start slot of every fully free window of `length` slots, ascending
+    def window_starts(self, length):
+        if length <= 0 or length > self.n_slots:
+            return np.empty(0, dtype=np.int64)
+        ranges = [np.arange(a, b - length + 1) for a, b in self.runs(length)]
+        return np.concatenate(ranges) if ranges else np.empty(0, dtype=np.int64)
+
+    def mask(self):
+        mask = np.zeros(self.n_slots, dtype=bool)
+        for a, b in zip(self.starts, self.stops):
+            mask[a:b] = True
+        return mask
+
+
+# best_window() over the windows a FreeTimeIndex reports as free
+def best_free_window(index, length, prefix, minimize=False):
+    starts = index.window_starts(length)
+    if not len(starts):
+        return None, None
+    means = (prefix[starts + length] - prefix[starts]) / length
+    scores = np.round(means, SCORE_DECIMALS)
+    pos = int(np.argmin(scores)) if minimize else int(np.argmax(scores))
+    return int(starts[pos]), float(means[pos])
+
+
+# Number of slots a task of `duration` hours occupies
+def duration_slots(duration, slots_per_hour=1):
+    return int(round(float(duration) * slots_per_hour))
+
+
+# Energy level a task works best at: its "energy" field (from the task
+# catalog), or None. Sleep has none. It is a preference, not a constraint:
+# tasks are still placed on lower windows, which are flagged.
+def required_energy(task):
+    if task["specific"] == "Sleep":
+        return None
+    try:
+        energy = task["energy"]
+    except KeyError:
+        return None
+    return None if energy is None else float(energy)
+
+
+# Recommendation dict for a task placed on `block` (a list of slots) or None.
+# Sleep reports start/end, every other task its start "time". A block whose
+# mean energy (from the curve's prefix sums) is below the task's energy level
+# is marked "below_requirement".
+def _recommendation(task, block, prefix):
+    duration = int(task["duration"])
+    if task["specific"] == "Sleep":
+        return {"task": task["specific"], "duration": duration,
+                "start": block[0] if block else None,
+                "end": block[-1] + 1 if block else None,
+                "block": block}
+    rec = {"task": task["specific"], "duration": duration,
+           "time": block[0] if block else None,
+           "block": block}
+    required = required_energy(task)
+    if block and required is not None:
+        mean = (prefix[block[-1] + 1] - prefix[block[0]]) / len(block)
+        if round(mean, SCORE_DECIMALS) < required:
+            rec["below_requirement"] = True
+    return rec
+
+
+# Greedy placement of tasks in list order, each into its best free window.
+# Sleep takes the lowest-energy window, every other task the highest one.
+# Returns one recommendation dict per task, in the same format the
+# Task Scheduler tab renders.
+def schedule_tasks(energy, tasks, slots_per_hour=1):
+    energy = np.asarray(energy, dtype=np.float64)
+    prefix = prefix_sums(energy)
+    index = FreeTimeIndex(len(energy))
+    recommendations = []
+    for task in tasks:
+        length = duration_slots(task["duration"], slots_per_hour)
+        is_sleep = task["specific"] == "Sleep"
+        start, _ = best_free_window(index, length, prefix, minimize=is_sleep)
+        block = list(range(start, start + length)) if start is not None else None
+        if block:
+            index.occupy(start, length)
+        recommendations.append(_recommendation(task, block, prefix))
+    return recommendations
+
+
+# -------------------------------
+# Incremental rescheduling
+# -------------------------------
+# Keeps a schedule's blocks and free-time index so that adding or removing
+# one task does not rebuild the whole plan: an added task takes the best
+# window that is still free, and a removed task frees its block for the
+# tasks that previously found no room. Every other task keeps its block.
+
+class IncrementalSchedule:
+    def __init__(self, energy, slots_per_hour=1):
+        self.energy = np.asarray(energy, dtype=np.float64)
+        self.slots_per_hour = slots_per_hour
+        self.prefix = prefix_sums(self.energy)
+        self.index = FreeTimeIndex(len(self.energy))
+        self.tasks = []
+        self.blocks = []  # (start, length) per task, or None when unplaced
+        self.approximate = False  # adopted from optimize_schedule()'s fallback
+
+    # Adopt a schedule computed by schedule_tasks() / optimize_schedule()
+    @classmethod
+    def from_recommendations(cls, energy, tasks, recommendations, slots_per_hour=1):
+        schedule = cls(energy, slots_per_hour)
+        schedule.approximate = any(rec.get("approximate") for rec in recommendations)
+        for task, rec in zip(tasks, recommendations):
+            block = rec["block"]
+            schedule.tasks.append(task)
+            schedule.blocks.append((block[0], len(block)) if block else None)
+            if block:
+                schedule.index.occupy(block[0], len(block))
+        return schedule
+
+    # True when this schedule was built for the given energy curve
+    def matches(self, energy):
+        return np.array_equal(self.energy, np.asarray(energy, dtype=np.float64))
+
+    def _place(self, position):
+        task = self.tasks[position]
+        length = duration_slots(task["duration"], self.slots_per_hour)
+        start, _ = best_free_window(self.index, length, self.prefix, minimize=task["specific"] == "Sleep")
+        if start is not None:
+            self.index.occupy(start, length)
+            self.blocks[position] = (start, length)
+
+    def add(self, task):
+        self.tasks.append(task)
+        self.blocks.append(None)
+        self._place(len(self.tasks) - 1)
+
+    def remove(self, position):
+        self.tasks.pop(position)
+        block = self.blocks.pop(position)
+        if block is None:
+            return
+        self.index.release(*block)
+        for i, placed in enumerate(self.blocks):
+            if placed is None:
+                self._place(i)
+
+    def recommendations(self):
+        return [_recommendation(task, list(range(b[0], b[0] + b[1])) if b else None, self.prefix)
+                for task, b in zip(self.tasks, self.blocks)]
+
+
+# -------------------------------
+# Globally optimal placement
+# -------------------------------
+# Tasks of the same kind (same slot length, Sleep or not) are interchangeable,
+# so the DP state is (slot, how many of each kind are already placed). Only
+# count vectors whose total length fits in the day can occur, so just those
+# are enumerated, and every slot step is evaluated for all of them at once
+# with numpy:
+#
+#   V[i][p] = max(V[i+1][p],                                 slot i left idle
+#                 fit_k[i] + BONUS + V[i+len_k][p + e_k])    a kind-k task starts at i
+#
+# A placed task earns a fixed bonus larger than any achievable fit, so the
+# optimum places as many tasks as possible and then maximizes total fit:
+# the window's energy sum for normal tasks and (peak - energy) summed for
+# Sleep. Within a kind, the blocks go to the tasks in order of their energy
+# level, so the most demanding task gets the highest block.
+#
+# The count vectors multiply with the number of distinct task lengths, so
+# many tasks of different lengths (e.g. quarter-hour durations) can exceed
+# the time or state budget. Those fall back to greedy placement improved by
+# local repair, and their recommendations are marked "approximate".
+
+DEFAULT_TIME_BUDGET = 1.0  # seconds
+DEFAULT_MAX_STATES = 5_000_000  # (slots + 1) x count vectors, 8 bytes each
+
+
+class ScheduleBudgetExceeded(Exception):
+    pass
+
+
+# Group tasks into kinds: returns (kinds, task indices per kind), where a
+# kind is (slot length, is_sleep). Zero-length tasks are never placed.
+def _task_kinds(tasks, slots_per_hour):
+    members = {}
+    for index, task in enumerate(tasks):
+        kind = (duration_slots(task["duration"], slots_per_hour), task["specific"] == "Sleep")
+        members.setdefault(kind, []).append(index)
+    kinds = [kind for kind in members if kind[0] > 0]
+    return kinds, [members[kind] for kind in kinds]
+
+
+# Per-kind fit of starting at each slot; -inf where the window does not fit
+def _kind_fits(energy, prefix, kinds):
+    n_slots = len(energy)
+    peak = float(energy.max()) if n_slots else 0.0
+    fits = []
+    for length, is_sleep in kinds:
+        fit = np.full(n_slots, -np.inf)
+        if length <= n_slots:
+            sums = prefix[length:] - prefix[:-length]
+            fit[:len(sums)] = peak * length - sums if is_sleep else sums
+        fits.append(fit)
+    return fits
+
+
+# Every placed-count vector whose total length fits in n_slots, as an
+# (n_vectors, n_kinds) array with the all-zero vector first
+def _count_vectors(lengths, counts, n_slots, max_vectors):
+    vectors = np.zeros((1, 0), dtype=np.int64)
+    used = np.zeros(1, dtype=np.int64)
+    for length, count in zip(lengths, counts):
+        parts_v, parts_u = [], []
+        for c in range(min(count, n_slots // length) + 1):
+            keep = used + c * length <= n_slots
+            parts_v.append(np.column_stack([vectors[keep], np.full(int(keep.sum()), c)]))
+            parts_u.append(used[keep] + c * length)
+        vectors, used = np.concatenate(parts_v), np.concatenate(parts_u)
+        if len(vectors) > max_vectors:
+            raise ScheduleBudgetExceeded(f"more than {max_vectors} count vectors")
+    return vectors, used
+
+
+# Start slots chosen for each kind, by walking the DP table forward
+def _optimal_starts(energy, kinds, counts, time_budget, max_states):
+    deadline = time.monotonic() + time_budget
+    n_slots = len(energy)
+    lengths = [kind[0] for kind in kinds]
+    vectors, used = _count_vectors(lengths, counts, n_slots, max_states // (n_slots + 1))
+    n_vectors = len(vectors)
+
+    # successor[k][p] is the index of p with one more kind-k task, or -1
+    radix = np.cumprod([1] + [c + 1 for c in counts[:-1]]).astype(np.int64)
+    keys = vectors @ radix
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    successors = []
+    for k, length in enumerate(lengths):
+        target = keys + radix[k]
+        pos = np.minimum(np.searchsorted(sorted_keys, target), n_vectors - 1)
+        ok = (vectors[:, k] < counts[k]) & (used + length <= n_slots) & (sorted_keys[pos] == target)
+        successors.append(np.where(ok, order[pos], -1))
+    holders = [np.flatnonzero(succ >= 0) for succ in successors]
+    targets = [succ[h] for succ, h in zip(successors, holders)]
+
+    fits = _kind_fits(energy, prefix_sums(energy), kinds)
+    bonus = 1.0 + n_slots * (2.0 * float(np.abs(energy).max()) if n_slots else 0.0)
+
+    # value[i][p] is the best score from slot i onwards with vector p placed
+    value = np.zeros((n_slots + 1, n_vectors))
+    for i in range(n_slots - 1, -1, -1):
+        if time.monotonic() > deadline:
+            raise ScheduleBudgetExceeded(f"time budget of {time_budget}s exceeded")
+        best = value[i + 1].copy()
+        for k, length in enumerate(lengths):
+            if i + length > n_slots:
+                continue
+            candidate = fits[k][i] + bonus + value[i + length][targets[k]]
+            best[holders[k]] = np.maximum(best[holders[k]], candidate)
+        value[i] = best
+
+    starts = [[] for _ in kinds]
+    i, p = 0, 0
+    while i < n_slots:
+        for k, length in enumerate(lengths):
+            nxt = successors[k][p]
+            if (nxt >= 0 and i + length <= n_slots
+                    and value[i][p] == fits[k][i] + bonus + value[i + length][nxt]):
+                starts[k].append(i)
+                p = nxt
+                i += length
+                break
+        else:
+            i += 1
+    return starts
+
+
+# True when items (slot lengths, longest first) fit into runs of the given
+# free lengths by first-fit decreasing
+def _packs(items, runs):
+    runs = list(runs)
+    for item in items:
+        for r, room in enumerate(runs):
+            if room >= item:
+                runs[r] -= item
+                break
+        else:
+            return False
+    return True
+
+
+PACKING_CANDIDATES = 32  # best windows tried per task before the one known to pack
+
+
+# Start slot per task (None when unplaced) for problems past the DP's budget.
+# Any tasks whose lengths sum to at most the day can be laid out back to
+# back, so the most tasks that can be placed are the shortest ones up to the
+# day's length. Those are placed longest first, each in the best window that
+# still lets the rest pack into the remaining free runs (the first run's
+# left edge always does). That and greedy in list order and longest first
+# are compared by (tasks placed, total fit), and the best is repaired until
+# nothing improves or the deadline passes (always at least one round):
+#   - each placed task moves to its best window given all the others
+#   - an unplaced task replaces a placed one whose window it fits better
+#   - two placed tasks are freed and re-placed together, in either order
+# Moves are only taken when they strictly raise the total fit.
+def _repaired_starts(energy, tasks, slots_per_hour, deadline):
+    prefix = prefix_sums(energy)
+    n_slots = len(energy)
+    peak = float(energy.max()) if n_slots else 0.0
+    lengths = [duration_slots(task["duration"], slots_per_hour) for task in tasks]
+    sleep = [task["specific"] == "Sleep" for task in tasks]
+
+    def fit(i, start):
+        total = prefix[start + lengths[i]] - prefix[start]
+        return round(peak * lengths[i] - total if sleep[i] else total, SCORE_DECIMALS)
+
+    def score(starts):
+        placed = [i for i, s in enumerate(starts) if s is not None]
+        return len(placed), round(sum(fit(i, starts[i]) for i in placed), SCORE_DECIMALS)
+
+    def greedy(order):
+        index, starts = FreeTimeIndex(n_slots), [None] * len(tasks)
+        for i in order:
+            start = best_free_window(index, lengths[i], prefix, minimize=sleep[i])[0]
+            if start is not None:
+                index.occupy(start, lengths[i])
+                starts[i] = start
+        return index, starts
+
+    def packed(chosen):
+        index, starts = FreeTimeIndex(n_slots), [None] * len(tasks)
+        for pos, i in enumerate(chosen):
+            rest = [lengths[j] for j in chosen[pos + 1:]]
+            candidates = index.window_starts(lengths[i])
+            fits = np.array([fit(i, s) for s in candidates])
+            for start in candidates[np.argsort(-fits, kind="stable")[:PACKING_CANDIDATES]]:
+                index.occupy(int(start), lengths[i])
+                if _packs(rest, [b - a for a, b in index.runs()]):
+                    break
+                index.release(int(start), lengths[i])
+            else:
+                start = next(a for a, b in index.runs() if b - a >= lengths[i])
+                index.occupy(int(start), lengths[i])
+            starts[i] = int(start)
+        return index, starts
+
+    placeable = [i for i in sorted(range(len(tasks)), key=lambda i: lengths[i]) if lengths[i] > 0]
+    chosen = placeable[:int(np.searchsorted(np.cumsum([lengths[i] for i in placeable]), n_slots, "right"))]
+    longest_first = sorted((i for i in range(len(tasks)) if lengths[i] > 0), key=lambda i: -lengths[i])
+    index, starts = max([greedy(i for i in range(len(tasks)) if lengths[i] > 0), greedy(longest_first),
+                         packed(sorted(chosen, key=lambda i: -lengths[i]))], key=lambda c: score(c[1]))
+
+    changed = True
+    while changed and time.monotonic() <= deadline:
+        changed = False
+        for j, old in enumerate(starts):
+            if old is None:
+                continue
+            index.release(old, lengths[j])
+            start = best_free_window(index, lengths[j], prefix, minimize=sleep[j])[0]
+            if fit(j, start) > fit(j, old):
+                starts[j], changed = start, True
+            index.occupy(starts[j], lengths[j])
+        # Swaps: an unplaced task takes a placed one's place when that fits better
+        for u in [i for i, s in enumerate(starts) if s is None and lengths[i] > 0]:
+            for j, old in enumerate(starts):
+                if old is None:
+                    continue
+                index.release(old, lengths[j])
+                start = best_free_window(index, lengths[u], prefix, minimize=sleep[u])[0]
+                if start is not None and fit(u, start) > fit(j, old):
+                    index.occupy(start, lengths[u])
+                    starts[u], starts[j], changed = start, None, True
+                    break
+                index.occupy(old, lengths[j])
+        if changed:
+            continue
+        # Pairs: free two blocks and re-place both, in either order
+        placed = [j for j, s in enumerate(starts) if s is not None]
+        for a, j in enumerate(placed):
+            for k in placed[a + 1:]:
+                best_total = round(fit(j, starts[j]) + fit(k, starts[k]), SCORE_DECIMALS)
+                index.release(starts[j], lengths[j])
+                index.release(starts[k], lengths[k])
+                for first, second in ((j, k), (k, j)):
+                    s1 = best_free_window(index, lengths[first], prefix, minimize=sleep[first])[0]
+                    index.occupy(s1, lengths[first])
+                    s2 = best_free_window(index, lengths[second], prefix, minimize=sleep[second])[0]
+                    index.release(s1, lengths[first])
+                    total = None if s2 is None else round(fit(first, s1) + fit(second, s2), SCORE_DECIMALS)
+                    if total is not None and total > best_total:
+                        best_total, starts[first], starts[second], changed = total, s1, s2, True
+                index.occupy(starts[j], lengths[j])
+                index.occupy(starts[k], lengths[k])
+                if time.monotonic() > deadline:
+                    return starts
+    return starts
+
+
+# Schedule that maximizes total fit over all tasks at once. Same
+# recommendation format as schedule_tasks(). When the problem is too large
+# for the time or state budget, the greedy-plus-repair fallback (given the
+# same time budget again) is used and every recommendation carries
+# "approximate": True.
+def optimize_schedule(energy, tasks, slots_per_hour=1, time_budget=DEFAULT_TIME_BUDGET,
+                      max_states=DEFAULT_MAX_STATES):
+    energy = np.asarray(energy, dtype=np.float64)
+    if not tasks:
+        return []
+    kinds, members = _task_kinds(tasks, slots_per_hour)
+    counts = [len(m) for m in members]
+    approximate = False
+    try:
+        starts = _optimal_starts(energy, kinds, counts, time_budget, max_states) if kinds else []
+    except ScheduleBudgetExceeded:
+        approximate = True
+        task_starts = _repaired_starts(energy, tasks, slots_per_hour, time.monotonic() + time_budget)
+        starts = [[task_starts[i] for i in indices if task_starts[i] is not None] for indices in members]
+
+    # Highest blocks to the most demanding tasks; ties keep list order
+    prefix = prefix_sums(energy)
+    blocks = [None] * len(tasks)
+    for (length, _), indices, kind_starts in zip(kinds, members, starts):
+        kind_starts = sorted(kind_starts, key=lambda s: (-round(prefix[s + length] - prefix[s], SCORE_DECIMALS), s))
+        indices = sorted(indices, key=lambda i: -(required_energy(tasks[i]) or 0.0))
+        for index, start in zip(indices, kind_starts):
+            blocks[index] = list(range(start, start + length))
+
+    recommendations = [_recommendation(task, block, prefix) for task, block in zip(tasks, blocks)]
+    if approximate:
+        for rec in recommendations:
+            rec["approximate"] = True
+    return recommendations
+
+
+# -------------------------------
+# Robust placement over sampled energy curves
+# -------------------------------
+# `samples` is a (samples x slots) matrix of plausible energy curves, e.g.
+# thousands of noise draws around a profile. Tasks are placed by
+# optimize_schedule() on the per-slot low quantile of the samples (a level
+# each slot reaches in most draws, not just in one), and row-wise prefix
+# sums then give every placed block's mean in every sample in one vectorized
+# step, for its expected energy and confidence interval.
+
+DEFAULT_QUANTILE = 0.1
+DEFAULT_CONFIDENCE = 0.9
+
+
+def _sample_prefix(samples):
+    samples = np.asarray(samples, dtype=np.float64)
+    prefix = np.zeros((samples.shape[0], samples.shape[1] + 1))
+    np.cumsum(samples, axis=1, out=prefix[:, 1:])
+    return prefix
+
+
+# Adds "expected", "low" and "high" (the central `confidence` interval of
+# the block's mean energy across samples) to every placed recommendation
+def block_stats(samples, recommendations, confidence=DEFAULT_CONFIDENCE):
+    prefix = _sample_prefix(samples)
+    tail = (1.0 - confidence) / 2
+    for rec in recommendations:
+        block = rec.get("block")
+        if not block:
+            continue
+        means = (prefix[:, block[-1] + 1] - prefix[:, block[0]]) / len(block)
+        low, high = np.quantile(means, [tail, 1.0 - tail])
+        rec.update(expected=float(means.mean()), low=float(low), high=float(high))
+    return recommendations
+
+
+# optimize_schedule() on the per-slot `quantile` of the samples, with the
+# blocks' sample statistics added. Sleep is placed on the same curve; energy
+# levels are judged against it too, so "below_requirement" is conservative.
+def robust_schedule(samples, tasks, slots_per_hour=1, quantile=DEFAULT_QUANTILE,
+                    confidence=DEFAULT_CONFIDENCE):
+    samples = np.asarray(samples, dtype=np.float64)
+    curve = np.quantile(samples, quantile, axis=0)
+    return block_stats(samples, optimize_schedule(curve, tasks, slots_per_hour), confidence)
@@ -0,0 +1,144 @@
+import functools
+import random
+
+import numpy as np
+
+# -------------------------------
+# Simulated energy profiles
+# -------------------------------
+# Each profile is a base curve over the hour of day plus uniform noise,
+# clipped to the 1-4 energy scale and rounded to one decimal. Whole
+# (users, days, slots) matrices are drawn in one vectorized call from a
+# np.random.Generator, so a fixed seed always gives the same output.
+
+MIN_ENERGY = 1.0
+MAX_ENERGY = 4.0
+
+
+# Step profiles use the whole hour a slot falls in, so 10:45 still counts as 10
+def _morning_person(hour):
+    hour = np.floor(hour)
+    return np.where((hour >= 6) & (hour <= 10), 3.8, 2.0)
+
+
+def _night_owl(hour):
+    hour = np.floor(hour)
+    return np.where((hour >= 18) & (hour <= 23), 3.8, 2.0)
+
+
+def _spikes_valleys(hour):
+    return 2.5 + 1.0 * np.sin(2 * np.pi * hour / 24)
+
+
+def _no_pattern(hour):
+    return np.full(np.shape(hour), 2.5)
+
+
+# Profile name -> (base curve function, noise half-width)
+PROFILES = {
+    "Morning person": (_morning_person, 0.2),
+    "Night owl": (_night_owl, 0.2),
+    "Multiple spikes and valleys": (_spikes_valleys, 0.5),
+    "No discernible pattern": (_no_pattern, 1.5),
+}
+PROFILE_NAMES = list(PROFILES)
+
+
+def make_rng(seed=None):
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+# Hour of day (fractional) at the start of every slot
+def slot_hours(slots_per_day=24):
+    return np.arange(slots_per_day) * (24.0 / slots_per_day)
+
+
+# Noise-free base curve of a profile, one value per slot
+def base_curve(profile, slots_per_day=24):
+    base_fn, _ = PROFILES[profile]
+    return base_fn(slot_hours(slots_per_day))
+
+
+# Energy matrix of shape (users, days, slots_per_day) for one profile
+def simulate(profile, users=1, days=1, slots_per_day=24, seed=None):
+    rng = make_rng(seed)
+    _, noise = PROFILES[profile]
+    base = base_curve(profile, slots_per_day)
+    values = base + rng.uniform(-noise, noise, size=(users, days, slots_per_day))
+    np.clip(values, MIN_ENERGY, MAX_ENERGY, out=values)
+    return np.round(values, 1)
+
+
+# Energy matrices for every profile, shape (profiles, users, days, slots_per_day),
+# ordered like PROFILE_NAMES
+def simulate_all(users=1, days=1, slots_per_day=24, seed=None):
+    rng = make_rng(seed)
+    base = np.stack([base_curve(name, slots_per_day) for name in PROFILE_NAMES])
+    noise = np.array([PROFILES[name][1] for name in PROFILE_NAMES])
+    shape = (len(PROFILE_NAMES), users, days, slots_per_day)
+    values = rng.uniform(-1.0, 1.0, size=shape)
+    values *= noise[:, None, None, None]
+    values += base[:, None, None, :]
+    np.clip(values, MIN_ENERGY, MAX_ENERGY, out=values)
+    return np.round(values, 1)
+
+
+# Standard deviation of a profile's uniform noise
+def noise_std(profile):
+    return PROFILES[profile][1] / np.sqrt(3.0)
+
+
+# (samples, slots_per_day) matrix of independent days drawn from a profile
+def profile_samples(profile, samples, slots_per_day=24, seed=None):
+    return simulate(profile, users=samples, slots_per_day=slots_per_day, seed=seed)[:, 0]
+
+
+# (samples, slots) matrix of normal noise around `curve` with per-slot std,
+# clipped to the energy scale
+def noise_samples(curve, std, samples, seed=None):
+    rng = make_rng(seed)
+    curve = np.asarray(curve, dtype=np.float64)
+    values = rng.standard_normal((samples, len(curve)))
+    values *= std
+    values += curve
+    return np.clip(values, MIN_ENERGY, MAX_ENERGY, out=values)
+
+
+# One simulated day for one user, as a 1-D array of slots_per_day values
+def simulate_day(profile, slots_per_day=24, seed=None):
+    return simulate(profile, slots_per_day=slots_per_day, seed=seed)[0, 0]
+
+
+# -------------------------------
+# Shared simulated days
+# -------------------------------
+# Sessions draw from a fixed pool of seeds per profile and keep only the
+# (profile, seed) pair; the curve itself is a read-only array cached once per
+# process, so sessions that land on the same draw share one copy.
+
+SHARED_SEEDS = 64
+
+
+def random_shared_seed():
+    return random.randrange(SHARED_SEEDS)
+
+
+@functools.lru_cache(maxsize=len(PROFILES) * SHARED_SEEDS)
+def shared_day(profile, seed, slots_per_day=24):
+    day = simulate_day(profile, slots_per_day=slots_per_day, seed=seed)
+    day.flags.writeable = False
+    return day
+
+
+# Profile whose base curve is closest (RMSE) to `curve` over the slots where
+# mask is set; the first profile when nothing is observed
+def nearest_profile(curve, mask=None):
+    curve = np.asarray(curve, dtype=np.float64)
+    mask = np.isfinite(curve) if mask is None else np.asarray(mask, dtype=bool) & np.isfinite(curve)
+    if not mask.any():
+        return PROFILE_NAMES[0]
+    bases = np.stack([base_curve(name, len(curve)) for name in PROFILE_NAMES])
+    errors = ((bases[:, mask] - curve[mask]) ** 2).mean(axis=1)
+    return PROFILE_NAMES[int(np.argmin(errors))]
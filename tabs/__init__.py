@@ -0,0 +1,14 @@
+# -------------------------------
+# Dashboard tabs
+# -------------------------------
+# One module per tab, each exposing render(timer). app.py imports only the
+# selected tab, so a tab's heavier dependencies (pandas, plotly, the
+# components API) are not loaded until that tab is first shown.
+
+# Tab label -> module name
+TABS = {
+    "Energy Tracker": "tabs.energy_tracker",
+    "Energy Graph": "tabs.energy_graph",
+    "Task Scheduler": "tabs.task_scheduler",
+    "Chat Bot": "tabs.chat_bot",
+}
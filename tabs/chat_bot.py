@@ -0,0 +1,46 @@
+import streamlit as st
+import streamlit.components.v1 as components
+
+# -------------------------------
+# CHAT BOT TAB
+# -------------------------------
+
+CHAT_HTML = """
+<div id="persistent-chat" style="position: fixed; bottom: 20px; right: 20px; width: 350px; height: 500px; z-index: 10000; border: none;">
+  <div id="chatbase-container"></div>
+  <script>
+  (function(){
+    if(!window.chatbase || window.chatbase("getState") !== "initialized"){
+      window.chatbase = (...args) => {
+        if(!window.chatbase.q){ window.chatbase.q = []; }
+        window.chatbase.q.push(args);
+      };
+      window.chatbase = new Proxy(window.chatbase, {
+        get(target, prop){
+          if(prop === "q"){ return target.q; }
+          return (...args) => target(prop, ...args);
+        }
+      });
+    }
+    const onLoad = function(){
+      const script = document.createElement("script");
+      script.src = "https://www.chatbase.co/embed.min.js";
+      script.id = "MdwqEnO0QpWV58ghfAv37";
+      script.domain = "www.chatbase.co";
+      document.body.appendChild(script);
+    };
+    if(document.readyState === "complete"){
+      onLoad();
+    } else {
+      window.addEventListener("load", onLoad);
+    }
+  })();
+  </script>
+</div>
+"""
+
+
+def render(timer):
+    st.header("Chat Bot")
+    st.write("Chat with our assistant via the Chatbase widget below:")
+    components.html(CHAT_HTML, height=520, width=370)
@@ -0,0 +1,61 @@
+import streamlit as st
+
+from aggregates import WEEKDAY_NAMES
+from caching import cached_figure
+from charts import DEFAULT_MAX_FRAMES, animation_frames
+from simulation import PROFILE_NAMES, random_shared_seed, shared_day
+
+# -------------------------------
+# ENERGY GRAPH TAB
+# -------------------------------
+
+
+def render(timer):
+    st.header("Energy Graph")
+    st.write("View your energy data (Results).")
+    hourly = st.session_state.hourly
+    if not hourly.empty:
+        hours = hourly.observed()
+        with timer.span("figure.hourly"):
+            fig = cached_figure("hourly_energy_figure", hours, hourly.mean()[hours], hourly.std()[hours])
+        with timer.span("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": True})
+    else:
+        st.write("No energy data available yet. Please record your energy levels.")
+
+    rollup = st.session_state.rollup
+    if not rollup.empty:
+        st.subheader("Trends")
+        window_days = st.slider("Window (days)", min_value=7, max_value=365, value=28, step=7, key="trend_window")
+        rolling_days = st.slider("Rolling mean (days)", min_value=1, max_value=28, value=7, key="trend_rolling")
+        with timer.span("figure.heatmap"):
+            fig = cached_figure("weekday_heatmap_figure", rollup.weekday_means(window_days), WEEKDAY_NAMES,
+                                f"Average Energy by Weekday and Hour - last {window_days} days")
+        with timer.span("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+        daily, rolling = rollup.daily_trend(window_days, rolling_days)
+        with timer.span("figure.trend"):
+            fig = cached_figure("trend_figure", rollup.dates(window_days), daily, rolling, rolling_days,
+                                f"Daily Energy Trend - last {window_days} days")
+        with timer.span("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+    
+    st.subheader("Simulation")
+    sim_toggle = st.checkbox("Show Simulation", value=False, key="sim_toggle")
+    if sim_toggle:
+        sim_sample = st.selectbox("Select sample user:", PROFILE_NAMES)
+        st.write(f"Simulating data for: {sim_sample}")
+        # Keep one shared draw per profile so unrelated reruns reuse the cached figure
+        sim_seeds = st.session_state.setdefault("sim_seeds", {})
+        if sim_sample not in sim_seeds:
+            sim_seeds[sim_sample] = random_shared_seed()
+        with timer.span("simulation"):
+            energy_values = shared_day(sim_sample, sim_seeds[sim_sample])
+        max_frames = st.slider("Animation frames", min_value=2, max_value=len(energy_values),
+                               value=min(DEFAULT_MAX_FRAMES, len(energy_values)), key="sim_max_frames")
+        st.session_state.simulated_profile = (sim_sample, sim_seeds[sim_sample])
+        with timer.span("figure.simulation"):
+            fig = cached_figure("simulation_figure", animation_frames(energy_values, max_frames=max_frames),
+                                f"Simulated Average Hourly Energy Levels - {sim_sample}")
+        with timer.span("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": True})
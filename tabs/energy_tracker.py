@@ -0,0 +1,55 @@
+import datetime
+
+import streamlit as st
+
+from energy_log import to_epoch
+
+# -------------------------------
+# ENERGY TRACKER TAB
+# -------------------------------
+
+
+def render(timer):
+    st.header("Energy Tracker")
+    st.write("This is where you track your energy levels (Response).")
+    st.subheader("What's your current energy level?")
+    def toggle_option(option_value):
+        st.session_state.selected_energy = option_value if st.session_state.selected_energy != option_value else None
+    if st.button(f"{'●' if st.session_state.selected_energy==4 else '○'} 4 (Awesome)", key="option_4", on_click=toggle_option, args=(4,)):
+        pass
+    if st.button(f"{'●' if st.session_state.selected_energy==3 else '○'} 3 (Pretty ok)", key="option_3", on_click=toggle_option, args=(3,)):
+        pass
+    if st.button(f"{'●' if st.session_state.selected_energy==2 else '○'} 2 (Sluggish)", key="option_2", on_click=toggle_option, args=(2,)):
+        pass
+    if st.button(f"{'●' if st.session_state.selected_energy==1 else '○'} 1 (Absolutely Awful)", key="option_1", on_click=toggle_option, args=(1,)):
+        pass
+    if st.session_state.selected_energy is not None:
+        if st.button("Submit Response", key="submit_response"):
+            now = datetime.datetime.now()
+            hour_val = now.hour
+            energy_val = st.session_state.selected_energy
+            st.session_state.data.append(now, hour_val, energy_val)
+            st.session_state.hourly.add(hour_val, energy_val)
+            st.session_state.rollup.add(to_epoch(now), hour_val, energy_val)
+            st.session_state.energy_curve.add(hour_val, energy_val)
+            st.success("Response recorded!")
+            st.session_state.selected_energy = None
+
+    with st.expander("Import history"):
+        st.write("Backfill readings from another tracker: a CSV with timestamp, energy and optional hour columns.")
+        upload = st.file_uploader("Energy log CSV", type=["csv"], key="import_log")
+        if upload is not None and st.button("Import", key="import_log_button"):
+            import bulk_io  # pandas is only needed once a file is imported
+            try:
+                with timer.span("bulk_import"):
+                    # Rows go straight to the database; only the aggregates
+                    # this session renders are kept in memory
+                    stats = bulk_io.import_file(upload, st.session_state.user_id, st.session_state.data.path,
+                                                st.session_state.hourly, st.session_state.rollup,
+                                                st.session_state.energy_curve)
+            # Missing columns, empty uploads (EmptyDataError), malformed CSV
+            # (ParserError) and bad encodings are all ValueErrors
+            except ValueError as exc:
+                st.error(f"Could not import {upload.name}: {exc}")
+            else:
+                st.success(f"Imported {stats['imported']} readings ({stats['rejected']} rows skipped).")
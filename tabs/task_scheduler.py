@@ -0,0 +1,154 @@
+import numpy as np
+import streamlit as st
+
+from caching import cached_figure, cached_robust_schedule, cached_schedule
+from scheduler import DEFAULT_CONFIDENCE, IncrementalSchedule, block_stats, required_energy
+from simulation import (PROFILE_NAMES, base_curve, nearest_profile, noise_samples, noise_std, profile_samples,
+                        random_shared_seed, shared_day)
+from task_catalog import TaskRecord, default_catalog
+
+# -------------------------------
+# TASK SCHEDULER TAB
+# -------------------------------
+
+ENERGY_SOURCES = ["My responses", "Simulated profile"]
+ROBUST_SAMPLES = 2000  # noise draws scored per robust schedule
+
+
+# Callback to remove a task; a generated schedule frees its block instead of
+# being rebuilt
+def remove_task(index):
+    tasks = st.session_state.tasks
+    if 0 <= index < len(tasks):
+        tasks.pop(index)
+        if st.session_state.schedule is not None:
+            st.session_state.schedule.remove(index)
+    st.session_state.tasks = tasks
+
+
+def render(timer):
+    st.header("Task Scheduler")
+    st.write("Plan your day by adding tasks and receiving scheduling recommendations based on your energy curve.")
+    learned = st.session_state.energy_curve
+    source = st.radio("Schedule against:", ENERGY_SOURCES, index=0 if not learned.empty else 1,
+                      key="energy_source", horizontal=True)
+
+    energy_curve = None
+    if source == ENERGY_SOURCES[0]:
+        if learned.empty:
+            st.info("No responses yet. Record your energy in the Energy Tracker tab to build your curve.")
+        else:
+            # Hours without responses lean on the closest simulated profile
+            with timer.span("energy_curve"):
+                prior = nearest_profile(learned.curve())
+                energy_curve = learned.curve(base_curve(prior))
+            title = f"Your Energy Curve (filled in from: {prior})"
+            # Robust mode: day-to-day spread of the responses, or the prior's
+            # noise for hours with fewer than two responses
+            hourly = st.session_state.hourly
+            spread = np.where(hourly.count >= 2, hourly.std(), noise_std(prior))
+            draw_samples = lambda: noise_samples(energy_curve, spread, ROBUST_SAMPLES, seed=0)
+    else:
+        sim_sample = st.selectbox("Select sample user for scheduling:", PROFILE_NAMES, key="chat_sim_sample")
+        if st.button("Generate Simulated Data for Scheduling", key="gen_sim_data"):
+            st.session_state.simulated_profile = (sim_sample, random_shared_seed())
+            st.success("Simulated data generated for scheduling.")
+        if st.session_state.simulated_profile is not None:
+            with timer.span("simulation"):
+                energy_curve = shared_day(*st.session_state.simulated_profile)
+            title = f"Simulated Energy Levels - {st.session_state.simulated_profile[0]}"
+            draw_samples = lambda: profile_samples(st.session_state.simulated_profile[0], ROBUST_SAMPLES,
+                                                   seed=st.session_state.simulated_profile[1])
+
+    if energy_curve is not None:
+        st.subheader("Energy Graph for Scheduling")
+        hours = np.arange(len(energy_curve))
+        with timer.span("figure.energy"):
+            fig = cached_figure("energy_figure", hours, energy_curve, title)
+        with timer.span("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+    
+    st.subheader("Add Tasks for Your Day")
+    query = st.text_input("Search tasks", placeholder="e.g. study, gym, sleep", key="task_search")
+    with timer.span("task_search"):
+        matches = default_catalog().search(query)
+    if not matches:
+        st.warning("No tasks match your search.")
+    else:
+        picked = st.selectbox("Select Task", matches, key="task_spec_new",
+                              format_func=lambda t: f"{t.name} [{t.category} > {t.subcategory}]")
+        needs = "" if picked.name == "Sleep" else f" Works best at energy level {picked.energy} or higher."
+        st.caption(f"Usually takes {picked.duration} hrs.{needs}")
+        if picked.fixed_duration:
+            task_duration = picked.duration
+            st.info(f"{picked.name} duration is fixed at {picked.duration} hours for scheduling purposes.")
+        else:
+            # Keyed per task so picking another task resets the default duration
+            task_duration = st.number_input("Enter Task Duration (in hours, integer)", min_value=1, max_value=8,
+                                            step=1, value=min(max(picked.duration, 1), 8),
+                                            key=f"task_duration_{picked.name}")
+        if st.button("Add Task"):
+            new_task = TaskRecord(picked.category, picked.subcategory, picked.name, task_duration, picked.energy)
+            st.session_state.tasks.append(new_task)
+            if st.session_state.schedule is not None:
+                st.session_state.schedule.add(new_task)
+            st.success(f"Added task: {picked.name} ({task_duration} hrs)")
+    
+    if st.session_state.tasks:
+        st.subheader("Tasks for the Day")
+        for i, t in enumerate(st.session_state.tasks, start=1):
+            cols = st.columns([0.8, 0.2])
+            cols[0].write(f"{i}. {t.specific} ({t.duration} hrs) - [{t.category}" +
+                          (f" > {t.subcategory}]" if t.subcategory else "]"))
+            if cols[1].button("Remove", key=f"remove_{i}", on_click=remove_task, args=(i-1,)):
+                pass
+    
+    robust = st.checkbox("Robust schedule: score blocks across many noisy versions of the curve", key="robust_mode")
+    samples = None
+    if robust and energy_curve is not None:
+        with timer.span("samples"):
+            samples = draw_samples()
+
+    if st.button("Generate Schedule"):
+        if energy_curve is None:
+            st.error("Please record some energy responses or generate simulated data first.")
+        elif not st.session_state.tasks:
+            st.error("Please add at least one task.")
+        else:
+            with timer.span("scheduler"):
+                if samples is not None:
+                    schedule_recommendations = cached_robust_schedule(samples, st.session_state.tasks)
+                else:
+                    schedule_recommendations = cached_schedule(energy_curve, st.session_state.tasks)
+            st.session_state.schedule = IncrementalSchedule.from_recommendations(
+                energy_curve, st.session_state.tasks, schedule_recommendations)
+
+    # The generated schedule follows task adds/removes until the curve changes
+    schedule = st.session_state.schedule
+    if schedule is not None and (energy_curve is None or not schedule.matches(energy_curve)):
+        st.session_state.schedule = schedule = None
+    if schedule is not None:
+        schedule_recommendations = schedule.recommendations()
+        if samples is not None:
+            with timer.span("block_stats"):
+                block_stats(samples, schedule_recommendations)
+        st.subheader("Schedule Recommendations")
+        if schedule.approximate:
+            st.caption("Too many different task lengths to compare every arrangement, so this schedule was placed "
+                       "greedily and then improved. It places as many tasks as possible but may not be the best fit.")
+        for task, rec in zip(schedule.tasks, schedule_recommendations):
+            stats = (f". Expected energy {rec['expected']:.2f} ({DEFAULT_CONFIDENCE:.0%} interval "
+                     f"{rec['low']:.2f} to {rec['high']:.2f})" if "expected" in rec else "")
+            if rec.get("below_requirement"):
+                stats += f". Below the energy level {required_energy(task):g} this task works best at"
+            if rec["task"] == "Sleep" and rec["start"] is not None:
+                st.write(f"Task: {rec['task']}, Duration: {rec['duration']} hrs. Recommended block: {int(rec['start'])}:00 to {int(rec['end'])}:00{stats}")
+            elif rec.get("time") is not None:
+                st.write(f"Task: {rec['task']}, Duration: {rec['duration']} hrs. Recommended block: {rec['block'][0]}:00 to {rec['block'][-1]+1}:00{stats}")
+            else:
+                st.write(f"Task: {rec['task']}, Duration: {rec['duration']} hrs. No available time slot found.")
+
+        with timer.span("figure.schedule"):
+            fig = cached_figure("energy_figure", hours, energy_curve, title, schedule_recommendations)
+        with timer.span("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,151 @@
+import functools
+import heapq
+import json
+import os
+import re
+import sys
+from bisect import bisect_left
+from typing import NamedTuple
+
+# -------------------------------
+# Task catalog for the Task Scheduler
+# -------------------------------
+# Tasks live in task_catalog.json as a flat list of
+#   {"category", "subcategory", "name", "duration", "energy"[, "fixed_duration"]}
+# entries: duration is the default length in hours, energy the level (1-4)
+# the task needs, and fixed_duration marks tasks whose length cannot be
+# changed (Sleep). Extra user-defined tasks are read from user_tasks.json
+# next to this module when it exists. The catalog and its search index are
+# built once per process.
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CATALOG_PATH = os.path.join(_HERE, "task_catalog.json")
+USER_CATALOG_PATH = os.path.join(_HERE, "user_tasks.json")
+DEFAULT_RESULTS = 50
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text):
+    return _TOKEN.findall(text.lower())
+
+
+class CatalogTask(NamedTuple):
+    category: str
+    subcategory: str
+    name: str
+    duration: int
+    energy: int
+    fixed_duration: bool = False
+
+
+def _parse(entry, source, position):
+    try:
+        return CatalogTask(sys.intern(entry["category"]), sys.intern(entry["subcategory"]),
+                           sys.intern(entry["name"]), int(entry["duration"]), int(entry["energy"]),
+                           bool(entry.get("fixed_duration", False)))
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"{source}: task #{position} is invalid ({exc!r})") from None
+
+
+# Tasks plus a token index for type-ahead search. Every token of a task's
+# name, subcategory and category maps to the tasks containing it; the tokens
+# are kept sorted, so all tokens starting with a query prefix form one
+# contiguous range found by bisection. Tasks are identified by (category,
+# subcategory, name): a later entry with all three equal replaces the earlier
+# one in place, so user files can override the bundled defaults, while a task
+# with the same name under another category or subcategory is kept as a
+# separate task.
+class TaskCatalog:
+    def __init__(self, tasks):
+        unique = {}
+        for task in tasks:
+            unique[task.category, task.subcategory, task.name] = task
+        self.tasks = list(unique.values())
+        postings = {}
+        for i, task in enumerate(self.tasks):
+            for token in set(_tokens(f"{task.name} {task.subcategory} {task.category}")):
+                postings.setdefault(token, []).append(i)
+        self._tokens = sorted(postings)
+        self._postings = [postings[token] for token in self._tokens]
+        self._name_tokens = [_tokens(task.name) for task in self.tasks]
+
+    @classmethod
+    def from_files(cls, *paths):
+        tasks = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)["tasks"]
+            tasks.extend(_parse(entry, path, i) for i, entry in enumerate(entries, start=1))
+        return cls(tasks)
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def categories(self):
+        return list(dict.fromkeys(task.category for task in self.tasks))
+
+    # Tasks whose tokens match every query word as a prefix, best first:
+    # names starting with the query, then more name matches, then catalog order
+    def search(self, query, limit=DEFAULT_RESULTS):
+        words = _tokens(query)
+        if not words:
+            return self.tasks[:limit]
+        matches = None
+        for word in words:
+            lo = bisect_left(self._tokens, word)
+            hi = bisect_left(self._tokens, word + "\x7f", lo)
+            found = set()
+            for postings in self._postings[lo:hi]:
+                found.update(postings)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+
+        def rank(i):
+            name = self._name_tokens[i]
+            in_name = sum(any(token.startswith(word) for token in name) for word in words)
+            return (not (name and name[0].startswith(words[0])), -in_name, i)
+        return [self.tasks[i] for i in heapq.nsmallest(limit, matches, key=rank)]
+
+
+# The process-wide catalog: the bundled tasks plus the user's, if any
+@functools.lru_cache(maxsize=1)
+def default_catalog():
+    paths = [DEFAULT_CATALOG_PATH]
+    if os.path.exists(USER_CATALOG_PATH):
+        paths.append(USER_CATALOG_PATH)
+    return TaskCatalog.from_files(*paths)
+
+
+# -------------------------------
+# Task records
+# -------------------------------
+# Compact per-session representation of a scheduled task. Category strings
+# are interned so every session's records point at one copy. energy is the
+# level the task works best at (None for no preference); the scheduler gives
+# the highest blocks to the most demanding tasks and flags blocks below it.
+# Records also support task["field"] access, so the scheduler treats them
+# like the task dicts used by batch input.
+class TaskRecord:
+    __slots__ = ("category", "subcategory", "specific", "duration", "energy")
+
+    def __init__(self, category, subcategory, specific, duration, energy=None):
+        self.category = sys.intern(category)
+        self.subcategory = sys.intern(subcategory or "")
+        self.specific = sys.intern(specific)
+        self.duration = int(duration)
+        self.energy = None if energy is None else int(energy)
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (f"TaskRecord({self.category!r}, {self.subcategory!r}, {self.specific!r}, {self.duration}, "
+                f"{self.energy!r})")
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from aggregates import EnergyCurve
+
+
+def _replayed(slots, energies, **kwargs):
+    curve = EnergyCurve(**kwargs)
+    for slot, energy in zip(slots, energies):
+        curve.add(int(slot), float(energy))
+    return curve
+
+
+@pytest.mark.parametrize("alpha", [0.05, 0.1, 0.5, 1.0])
+def test_add_many_matches_adding_one_by_one(alpha):
+    rng = np.random.default_rng(0)
+    slots = rng.integers(0, 24, 3000)
+    energies = rng.integers(1, 5, 3000)
+    expected = _replayed(slots, energies, alpha=alpha)
+    curve = EnergyCurve(alpha=alpha)
+    for part in np.array_split(np.arange(3000), [1, 17, 1000]):  # includes a one-row and an empty-slot batch
+        curve.add_many(slots[part], energies[part])
+    np.testing.assert_array_equal(curve.count, expected.count)
+    np.testing.assert_allclose(curve.value, expected.value, rtol=0, atol=1e-12)
+
+
+def test_first_responses_are_averaged():
+    curve = EnergyCurve(alpha=0.1)
+    curve.add_many([5, 5, 5], [1, 2, 3])
+    assert curve.value[5] == pytest.approx(2.0)
+
+
+def test_curve_falls_back_to_the_prior_where_nothing_was_recorded():
+    curve = EnergyCurve(n_slots=3, prior_weight=3.0)
+    curve.add(0, 4)
+    prior = np.array([1.0, 2.0, 3.0])
+    blended = curve.curve(prior)
+    assert blended[0] == pytest.approx((3.0 * 1.0 + 1 * 4.0) / 4.0)
+    np.testing.assert_array_equal(blended[1:], prior[1:])
+    assert np.isnan(curve.curve()[1:]).all()
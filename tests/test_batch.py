@@ -0,0 +1,23 @@
+import json
+
+from batch import run_batch
+
+ROWS = '''user_id,tasks,energy,profile,seed
+00123,"[{""specific"":""a"",""duration"":2}]",,Night owl,3
+2,"[{""specific"":""a""",,Night owl,
+,"[{""specific"":""a"",""duration"":2}]",,Nope,
+4,"[{""duration"":2}]",,Night owl,
+5,"[{""specific"":""a"",""duration"":2}]",1 2 3,,
+'''
+
+
+def test_bad_rows_produce_error_lines(tmp_path):
+    source, output = tmp_path / "rows.csv", tmp_path / "out.jsonl"
+    source.write_text(ROWS)
+    assert run_batch(str(source), str(output), workers=1) == 5
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(lines) == 5
+    assert "schedule" in lines[0]
+    assert all("error" in line for line in lines[1:])
+    assert [line["user_id"] for line in lines] == ["00123", "2", None, "4", "5"]
+    assert "expected 24 energy values" in lines[4]["error"]
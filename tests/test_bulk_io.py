@@ -0,0 +1,100 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregates import SlotAggregate
+from bulk_io import MAX_SECONDS, coerce_chunk, export_file, import_file, read_chunks
+from energy_log import EnergyLog, to_epoch
+
+
+def _coerce(csv):
+    (frame,) = read_chunks(io.StringIO(csv))
+    return coerce_chunk(frame)
+
+
+def _epoch(text):
+    return to_epoch(pd.Timestamp(text).to_pydatetime())
+
+
+@pytest.mark.parametrize("stamp", ["2024-03-01T10:30:00Z", "2024-03-01 10:30:00+02:00", "2024-03-01T10:30:00-0500",
+                                   "2024-03-01T10:30:00.250+05:30", "Fri, 01 Mar 2024 10:30:00 GMT"])
+def test_offsets_keep_the_wall_clock_time(stamp):
+    seconds, hours, energies, rejected = _coerce(f'timestamp,energy\n"{stamp}",3\n')
+    assert seconds.tolist() == [_epoch("2024-03-01 10:30:00")]
+    assert hours.tolist() == [10]
+    assert rejected == 0
+
+
+def test_mixed_offsets_in_one_chunk_keep_their_wall_clock_times():
+    csv = 'timestamp,energy\n"Fri, 01 Mar 2024 10:00:00 GMT",3\n"Fri, 01 Mar 2024 11:00:00 +0200",2\n'
+    seconds, hours, _, rejected = _coerce(csv)
+    assert seconds.tolist() == [_epoch("2024-03-01 10:00"), _epoch("2024-03-01 11:00")]
+    assert hours.tolist() == [10, 11]
+    assert rejected == 0
+
+
+def test_numeric_timestamps_are_epoch_seconds():
+    seconds, hours, _, rejected = _coerce("timestamp,energy\n1709287200,3\n-1,3\n4294967296,3\n")
+    assert seconds.tolist() == [1709287200]
+    assert hours.tolist() == [10]
+    assert rejected == 2
+
+
+@pytest.mark.parametrize("stamp", ["1969-12-31 23:59:59", "2106-02-07 06:28:16", "2200-01-01", "not a date", ""])
+def test_dates_outside_the_uint32_range_are_rejected(stamp):
+    seconds, _, _, rejected = _coerce(f"timestamp,energy\n2024-03-01 08:00,3\n{stamp},3\n")
+    assert seconds.tolist() == [_epoch("2024-03-01 08:00")]
+    assert rejected == 1
+
+
+def test_range_edges_are_accepted():
+    seconds, _, _, rejected = _coerce("timestamp,energy\n1970-01-01 00:00:00,3\n2106-02-07 06:28:15,3\n")
+    assert seconds.tolist() == [0, MAX_SECONDS - 1]
+    assert rejected == 0
+
+
+def test_hour_column_overrides_and_fills_from_the_timestamp():
+    csv = "timestamp,hour,energy\n2024-03-01 10:00,7,3\n2024-03-01 11:00,,3\n2024-03-01 12:00,24,3\n2024-03-01 13:00,2.5,3\n"
+    _, hours, _, rejected = _coerce(csv)
+    assert hours.tolist() == [7, 11]
+    assert rejected == 2
+
+
+def test_energy_is_rounded_and_out_of_range_rows_counted():
+    csv = "timestamp,energy\n" + "".join(f"2024-03-01 10:00,{e}\n" for e in ["1.4", "3.6", "0.4", "4.6", "x", ""])
+    _, _, energies, rejected = _coerce(csv)
+    assert energies.tolist() == [1, 4]
+    assert rejected == 4
+
+
+def test_missing_columns_raise():
+    with pytest.raises(ValueError):
+        _coerce("timestamp\n2024-03-01 10:00\n")
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_export_import_round_trip(tmp_path, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    db = str(tmp_path / "log.db")
+    rng = np.random.default_rng(0)
+    timestamps = rng.integers(0, MAX_SECONDS, 1000)
+    hours = rng.integers(0, 24, 1000)
+    energies = rng.integers(1, 5, 1000)
+    log = EnergyLog(db, "alice")
+    log.extend(timestamps, hours, energies)
+    log.close()
+
+    target = str(tmp_path / f"export{suffix}")
+    assert export_file(target, "alice", db, chunk_size=300) == 1000
+    hourly = SlotAggregate()
+    assert import_file(target, "bob", db, hourly=hourly, chunk_size=300) == {"imported": 1000, "rejected": 0}
+
+    bob = EnergyLog(db, "bob")
+    np.testing.assert_array_equal(bob.timestamps, timestamps)
+    np.testing.assert_array_equal(bob.hours, hours)
+    np.testing.assert_array_equal(bob.energies, energies)
+    np.testing.assert_array_equal(hourly.count, np.bincount(hours, minlength=24))
+    assert len(EnergyLog(db, "alice")) == 1000
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from scheduler import (FreeTimeIndex, IncrementalSchedule, best_window, free_segments, free_windows,
+                       optimize_schedule, schedule_tasks)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_random_occupy_release_matches_a_mask(seed):
+    rng = np.random.default_rng(seed)
+    n_slots = int(rng.integers(1, 80))
+    index, mask, blocks = FreeTimeIndex(n_slots), np.ones(n_slots, dtype=bool), []
+    for _ in range(50):
+        if blocks and rng.random() < 0.4:
+            start, length = blocks.pop(int(rng.integers(len(blocks))))
+            index.release(start, length)
+            mask[start:start + length] = True
+        else:
+            length = int(rng.integers(1, 8))
+            starts = index.window_starts(length)
+            np.testing.assert_array_equal(starts, np.flatnonzero(free_windows(mask, length)))
+            if len(starts):
+                start = int(rng.choice(starts))
+                assert index.is_free(start, length)
+                index.occupy(start, length)
+                mask[start:start + length] = False
+                blocks.append((start, length))
+        np.testing.assert_array_equal(index.mask(), mask)
+        assert index.runs() == free_segments(mask)
+        assert index.runs(3) == [(a, b) for a, b in free_segments(mask) if b - a >= 3]
+
+
+def test_release_merges_neighbouring_runs():
+    index = FreeTimeIndex(10)
+    index.occupy(2, 3)
+    index.occupy(6, 2)
+    assert index.runs() == [(0, 2), (5, 6), (8, 10)]
+    index.release(2, 3)
+    assert index.runs() == [(0, 6), (8, 10)]
+    index.release(6, 2)
+    assert index.runs() == [(0, 10)]
+
+
+def test_invalid_occupy_and_release_raise():
+    index = FreeTimeIndex(10)
+    index.occupy(3, 4)
+    with pytest.raises(ValueError):
+        index.occupy(5, 1)
+    with pytest.raises(ValueError):
+        index.release(0, 2)
+    with pytest.raises(ValueError):
+        index.release(6, 2)
+    with pytest.raises(ValueError):
+        index.release(9, 2)
+
+
+def test_from_mask_round_trips():
+    mask = np.array([1, 1, 0, 1, 0, 0, 1], dtype=bool)
+    assert FreeTimeIndex.from_mask(mask).runs() == free_segments(mask)
+
+
+def _blocks(recommendations):
+    return [rec["block"] for rec in recommendations]
+
+
+def test_adding_a_task_keeps_existing_blocks():
+    energy = np.round(np.random.default_rng(1).uniform(1, 4, 24), 1)
+    tasks = [{"specific": "Sleep", "duration": 8}, {"specific": "a", "duration": 2}]
+    schedule = IncrementalSchedule.from_recommendations(energy, tasks, optimize_schedule(energy, tasks))
+    before = _blocks(schedule.recommendations())
+    extra = {"specific": "b", "duration": 3}
+    schedule.add(extra)
+    after = _blocks(schedule.recommendations())
+    assert after[:2] == before
+    # The new task takes the best window left free by the existing blocks
+    free = np.ones(24, dtype=bool)
+    for block in before:
+        free[block] = False
+    start, _ = best_window(energy, free, 3)
+    assert after[2] == list(range(start, start + 3))
+
+
+def test_removing_a_task_places_tasks_that_did_not_fit():
+    energy = np.arange(24, dtype=float)
+    tasks = [{"specific": "a", "duration": 12}, {"specific": "b", "duration": 12}, {"specific": "c", "duration": 6}]
+    schedule = IncrementalSchedule.from_recommendations(energy, tasks, schedule_tasks(energy, tasks))
+    assert _blocks(schedule.recommendations())[2] is None
+    schedule.remove(0)
+    blocks = _blocks(schedule.recommendations())
+    assert blocks == [list(range(0, 12)), list(range(18, 24))]
+
+
+def test_incremental_schedule_matches_greedy_when_built_task_by_task():
+    rng = np.random.default_rng(2)
+    energy = np.round(rng.uniform(1, 4, 96), 1)
+    tasks = [{"specific": "Sleep" if i == 0 else f"task {i}", "duration": int(d)}
+             for i, d in enumerate(rng.integers(1, 5, 8))]
+    schedule = IncrementalSchedule(energy, slots_per_hour=4)
+    for task in tasks:
+        schedule.add(task)
+    assert schedule.recommendations() == schedule_tasks(energy, tasks, slots_per_hour=4)
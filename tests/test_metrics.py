@@ -0,0 +1,33 @@
+import json
+import threading
+
+from metrics import PROCESS_TIMINGS, export_if_due
+
+
+def test_concurrent_exports_never_fail_or_leave_temp_files(tmp_path):
+    path = str(tmp_path / "metrics.json")
+    PROCESS_TIMINGS.record("test_span", 1.0)
+    errors = []
+
+    def export():
+        for _ in range(50):
+            try:
+                export_if_due(path, interval=0)
+            except Exception as exc:
+                errors.append(exc)
+
+    threads = [threading.Thread(target=export) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert [p.name for p in tmp_path.iterdir()] == ["metrics.json"]
+    with open(path) as f:
+        assert "test_span" in json.load(f)["spans"]
+
+
+def test_exports_are_spaced_by_the_interval(tmp_path):
+    path = str(tmp_path / "metrics.json")
+    assert export_if_due(path, interval=0)
+    assert not export_if_due(path, interval=3600)
@@ -0,0 +1,164 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from scheduler import (IncrementalSchedule, block_stats, duration_slots, optimize_schedule, robust_schedule,
+                       schedule_tasks)
+
+
+def _fit(energy, task, block):
+    window = energy[block[0]:block[-1] + 1]
+    return float(energy.max() * len(window) - window.sum()) if task["specific"] == "Sleep" else float(window.sum())
+
+
+# (tasks placed, total fit) of the best assignment, by trying every start
+# (or no placement) for every task
+def _brute_force(energy, tasks):
+    n_slots = len(energy)
+    options = []
+    for task in tasks:
+        length = duration_slots(task["duration"])
+        starts = range(n_slots - length + 1) if 0 < length <= n_slots else range(0)
+        options.append([None] + list(starts))
+    best = (0, 0.0)
+    for starts in itertools.product(*options):
+        used = np.zeros(n_slots, dtype=int)
+        placed, fit = 0, 0.0
+        for task, start in zip(tasks, starts):
+            if start is None:
+                continue
+            length = duration_slots(task["duration"])
+            used[start:start + length] += 1
+            placed += 1
+            fit += _fit(energy, task, list(range(start, start + length)))
+        if used.max(initial=0) <= 1:
+            best = max(best, (placed, round(fit, 9)))
+    return best
+
+
+def _score(energy, tasks, recommendations):
+    blocks = [rec["block"] for rec in recommendations]
+    used = np.zeros(len(energy), dtype=int)
+    for task, block in zip(tasks, blocks):
+        if block:
+            assert len(block) == duration_slots(task["duration"])
+            assert block == list(range(block[0], block[-1] + 1))
+            used[block] += 1
+    assert used.max(initial=0) <= 1
+    return (sum(1 for b in blocks if b),
+            round(sum(_fit(energy, t, b) for t, b in zip(tasks, blocks) if b), 9))
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_optimize_schedule_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    energy = np.round(rng.uniform(1, 4, int(rng.integers(4, 11))), 1)
+    tasks = [{"specific": "Sleep" if rng.random() < 0.25 else f"task {i}", "duration": int(rng.integers(1, 5))}
+             for i in range(int(rng.integers(1, 5)))]
+    assert _score(energy, tasks, optimize_schedule(energy, tasks)) == _brute_force(energy, tasks)
+
+
+def test_optimize_schedule_never_places_fewer_tasks_than_greedy():
+    energy = np.array([1, 4, 1, 1, 4, 1], dtype=float)
+    tasks = [{"specific": "a", "duration": 1}, {"specific": "b", "duration": 3}, {"specific": "c", "duration": 2}]
+    greedy = _score(energy, tasks, schedule_tasks(energy, tasks))
+    optimal = _score(energy, tasks, optimize_schedule(energy, tasks))
+    assert optimal[0] >= greedy[0]
+    assert optimal[0] == 3
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_over_budget_fallback_places_the_most_tasks_and_beats_greedy(seed):
+    rng = np.random.default_rng(seed)
+    energy = np.round(rng.uniform(1, 4, int(rng.integers(4, 11))), 1)
+    tasks = [{"specific": "Sleep" if rng.random() < 0.25 else f"task {i}", "duration": int(rng.integers(i == 0, 5))}
+             for i in range(int(rng.integers(1, 6)))]
+    recs = optimize_schedule(energy, tasks, max_states=1)
+    assert all(rec["approximate"] for rec in recs)
+    placed, fit = _score(energy, tasks, recs)
+    assert placed == _brute_force(energy, tasks)[0]
+    assert (placed, fit) >= _score(energy, tasks, schedule_tasks(energy, tasks))
+
+
+def test_many_task_lengths_fall_back_and_are_flagged():
+    rng = np.random.default_rng(1)
+    energy = np.repeat(np.round(rng.uniform(1, 4, 24), 1), 4)
+    tasks = [{"specific": f"task {i}", "duration": d / 4, "energy": int(e)}
+             for i, (d, e) in enumerate(zip(rng.integers(1, 17, 30), rng.integers(1, 4, 30)))]
+    recs = optimize_schedule(energy, tasks, slots_per_hour=4)
+    lengths = np.sort([duration_slots(task["duration"], 4) for task in tasks])
+    assert all(rec["approximate"] for rec in recs)
+    assert sum(rec["block"] is not None for rec in recs) == np.searchsorted(np.cumsum(lengths), 96, "right")
+    assert IncrementalSchedule.from_recommendations(energy, tasks, recs, 4).approximate
+    assert "approximate" not in optimize_schedule(energy, tasks[:3], slots_per_hour=4)[0]
+
+
+def test_optimize_schedule_keeps_task_order_and_format():
+    energy = np.arange(24, dtype=float)
+    tasks = [{"specific": "Sleep", "duration": 8}, {"specific": "work", "duration": 2}, {"specific": "none", "duration": 0}]
+    recs = optimize_schedule(energy, tasks)
+    assert [rec["task"] for rec in recs] == ["Sleep", "work", "none"]
+    assert (recs[0]["start"], recs[0]["end"]) == (0, 8)
+    assert recs[1]["time"] == 22
+    assert recs[2]["block"] is None
+
+
+def test_energy_requirement_is_a_preference_not_a_constraint():
+    energy = np.array([1, 1, 4, 4, 1, 3, 3, 1], dtype=float)
+    tasks = [{"specific": "a", "duration": 2, "energy": 3.5}, {"specific": "b", "duration": 2, "energy": 3.5},
+             {"specific": "c", "duration": 1, "energy": 2}]
+    for scheduler in (schedule_tasks, optimize_schedule):
+        recs = scheduler(energy, tasks)
+        assert [rec["block"] for rec in recs[:2]] == [[2, 3], [5, 6]]
+        assert len(recs[2]["block"]) == 1
+        assert "below_requirement" not in recs[0]
+        assert recs[1]["below_requirement"] is True
+        assert recs[2]["below_requirement"] is True
+
+
+def test_optimize_schedule_gives_the_highest_blocks_to_the_most_demanding_tasks():
+    energy = np.array([4, 4, 1, 1, 2, 2, 1, 3, 3], dtype=float)
+    tasks = [{"specific": "easy", "duration": 2, "energy": 1}, {"specific": "hard", "duration": 2, "energy": 4},
+             {"specific": "medium", "duration": 2, "energy": 3}]
+    blocks = [rec["block"] for rec in optimize_schedule(energy, tasks)]
+    assert blocks == [[4, 5], [0, 1], [7, 8]]
+
+
+def test_robust_schedule_places_what_the_optimizer_places():
+    rng = np.random.default_rng(0)
+    energy = np.array([1, 4, 1, 1, 4, 1], dtype=float)
+    samples = energy + rng.normal(0, 0.01, (500, len(energy)))
+    tasks = [{"specific": "a", "duration": 1}, {"specific": "b", "duration": 3}, {"specific": "c", "duration": 2}]
+    robust = robust_schedule(samples, tasks)
+    assert [rec["block"] for rec in robust] == [rec["block"] for rec in optimize_schedule(energy, tasks)]
+    assert all(rec["block"] for rec in robust)
+
+
+def test_robust_schedule_prefers_blocks_that_are_good_in_most_draws():
+    rng = np.random.default_rng(0)
+    # Slot 1 averages higher but is usually low; slot 4 is reliably good
+    samples = np.tile([1.0, 1.0, 1.0, 1.0, 3.0, 1.0], (1000, 1))
+    samples[:, 1] = np.where(rng.random(1000) < 0.2, 14.0, 1.0)
+    recs = robust_schedule(samples, [{"specific": "a", "duration": 1}], quantile=0.1)
+    assert recs[0]["block"] == [4]
+    assert optimize_schedule(samples.mean(axis=0), [{"specific": "a", "duration": 1}])[0]["block"] == [1]
+
+
+def test_block_stats_reports_the_central_interval_of_block_means():
+    rng = np.random.default_rng(0)
+    samples = rng.uniform(1, 4, (4000, 6))
+    recs = [{"task": "a", "block": [1, 2]}, {"task": "b", "block": None}]
+    block_stats(samples, recs, confidence=0.8)
+    means = samples[:, 1:3].mean(axis=1)
+    assert recs[0]["expected"] == pytest.approx(means.mean())
+    assert recs[0]["low"] == pytest.approx(np.quantile(means, 0.1))
+    assert recs[0]["high"] == pytest.approx(np.quantile(means, 0.9))
+    assert recs[0]["low"] < recs[0]["expected"] < recs[0]["high"]
+    assert "expected" not in recs[1]
+
+
+def test_block_stats_interval_collapses_without_noise():
+    samples = np.tile(np.arange(8, dtype=float), (50, 1))
+    (rec,) = block_stats(samples, [{"task": "a", "block": [2, 3, 4]}])
+    assert rec["low"] == pytest.approx(3.0) and rec["expected"] == pytest.approx(3.0) and rec["high"] == pytest.approx(3.0)
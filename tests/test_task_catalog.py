@@ -0,0 +1,17 @@
+from task_catalog import CatalogTask, TaskCatalog
+
+
+def test_override_keys_on_category_subcategory_and_name():
+    bundled = [CatalogTask("Work", "Focus", "Deep work", 2, 3),
+               CatalogTask("Home", "Chores", "Laundry", 1, 1)]
+    user = [CatalogTask("Work", "Focus", "Deep work", 3, 4),
+            CatalogTask("Work", "Admin", "Deep work", 1, 2)]
+    catalog = TaskCatalog(bundled + user)
+    assert catalog.tasks == [user[0], bundled[1], user[1]]
+
+
+def test_search_matches_every_word_as_a_prefix():
+    catalog = TaskCatalog([CatalogTask("Work", "Focus", "Deep work", 2, 3),
+                           CatalogTask("Home", "Chores", "Laundry", 1, 1)])
+    assert [task.name for task in catalog.search("wor dee")] == ["Deep work"]
+    assert catalog.search("gardening") == []